@@ -5,7 +5,7 @@ Minimal code - delegates to services and UI components.
 import streamlit as st
 from config.config import UI_CONFIG
 st.set_page_config(**UI_CONFIG)
-from services.graph_service import GraphService
+from services.graph_service import get_graph_service
 from ui.components.file_uploader import render_file_uploader
 from ui.components.graph_visualizer import render_graph_visualization
 from utils.logger import setup_logger
@@ -18,8 +18,8 @@ def main():
     """Main application flow."""
     st.title("🧠 Text2Graph - Knowledge Graph Generator")
     
-    # Initialize graph service (handles Neo4j connection)
-    graph_service = GraphService()
+    # Shared graph service (handles Neo4j connection)
+    graph_service = get_graph_service()
     
     # Show connection status
     graph_service.show_connection_status()
@@ -25,6 +25,12 @@ NEO4J_CONFIG = {
     "NEO4J_USERNAME": os.getenv("NEO4J_USERNAME"),
     "NEO4J_PASSWORD": os.getenv("NEO4J_PASSWORD"),
     # "NEO4J_DATABASE": os.getenv("NEO4J_DATABASE", "neo4j"),
+    # Driver pool, shared by all sessions in the process
+    "NEO4J_MAX_POOL_SIZE": int(os.getenv("NEO4J_MAX_POOL_SIZE", "50")),
+    # Seconds to wait for a free pooled connection before failing
+    "NEO4J_ACQUISITION_TIMEOUT": float(os.getenv("NEO4J_ACQUISITION_TIMEOUT", "10")),
+    "NEO4J_CONNECTION_TIMEOUT": float(os.getenv("NEO4J_CONNECTION_TIMEOUT", "30")),
+    "NEO4J_MAX_CONNECTION_LIFETIME": int(os.getenv("NEO4J_MAX_CONNECTION_LIFETIME", "3600")),
 }
 
 # NLP Configuration
@@ -33,6 +39,13 @@ NLP_CONFIG = {
     "spacy_model_path": PROJECT_ROOT / "config" / "models" / "en_core_web_sm",
     "nltk_data_path": str(NLTK_DATA_DIR),
     "required_nltk_packages": ["punkt_tab"],  # ONLY punkt_tab is needed
+    "spacy_batch_size": int(os.getenv("T2G_SPACY_BATCH", "64")),
+    "spacy_n_process": int(os.getenv("T2G_SPACY_NPROC", max(1, min((os.cpu_count() or 1) - 1, 4)))),
+    # Below this many sentences, worker startup + pickling costs more than it saves
+    "spacy_multiprocess_min_sentences": 200,
+    # Parallel regex pattern extraction (set T2G_PARALLELISM=false to disable)
+    "pattern_parallelism": os.getenv("T2G_PARALLELISM", "true").lower() in ("1", "true", "yes"),
+    "pattern_parallel_min_bytes": 16 * 1024,
 }
 
 # File Processing Configuration
@@ -40,6 +53,9 @@ FILE_CONFIG = {
     "allowed_extensions": [".txt", ".csv", ".json"],
     "max_file_size_mb": 250,
     "encoding": "utf-8",
+    # CSV uploads at least this large are parsed and cleaned in row chunks
+    "csv_stream_min_mb": 25,
+    "csv_chunk_rows": 100_000,
 }
 
 # UI Configuration
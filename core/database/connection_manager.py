@@ -1,6 +1,8 @@
 """
-Neo4j connection manager with session state integration.
+Neo4j connection manager owning the process-wide driver.
 """
+import atexit
+import time
 import streamlit as st
 from neo4j import GraphDatabase, Driver
 from typing import Optional
@@ -9,14 +11,25 @@ from utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+# Seconds a successful connectivity check is trusted before re-verifying
+VERIFY_TTL_SECONDS = 30
+
 
 class Neo4jConnectionManager:
-    """Manages Neo4j driver lifecycle using Streamlit session state."""
+    """
+    Manages the Neo4j driver lifecycle.
+    
+    The driver is a connection pool meant to live for the whole process, so
+    it is kept on the manager (shared through the cached GraphService)
+    rather than per Streamlit session, and closed at interpreter exit.
+    """
     
     def __init__(self):
         """Initialize connection manager."""
-        if 'neo4j_driver' not in st.session_state:
-            self.connect()
+        self._driver: Optional[Driver] = None
+        self._last_verified: Optional[float] = None
+        atexit.register(self.close)
+        self.connect()
     
     def connect(self) -> Driver:
         """Establish Neo4j connection."""
@@ -34,18 +47,20 @@ class Neo4jConnectionManager:
             driver: Driver = GraphDatabase.driver(
                 uri,
                 auth=(user, password),
-                max_connection_lifetime=3600,
-                max_connection_pool_size=50,
-                connection_timeout=30
+                max_connection_lifetime=NEO4J_CONFIG["NEO4J_MAX_CONNECTION_LIFETIME"],
+                max_connection_pool_size=NEO4J_CONFIG["NEO4J_MAX_POOL_SIZE"],
+                connection_timeout=NEO4J_CONFIG["NEO4J_CONNECTION_TIMEOUT"],
+                connection_acquisition_timeout=NEO4J_CONFIG["NEO4J_ACQUISITION_TIMEOUT"],
+                keep_alive=True,
+                fetch_size=1000
             )
 
-            # Test connection
+            # Test connection (handshake only, no Cypher round-trip)
             logger.info("Testing connection...")
-            with driver.session() as session:
-                result = session.run("RETURN 1 as test")
-                result.single()
+            driver.verify_connectivity()
 
-            st.session_state.neo4j_driver = driver
+            self._driver = driver
+            self._last_verified = time.monotonic()
             logger.info("✅ Neo4j connection established successfully")
 
             return driver
@@ -72,23 +87,34 @@ class Neo4jConnectionManager:
             raise ConnectionError(f"Neo4j connection failed: {error_msg}")
         
     def get_driver(self) -> Driver:
-        """Get existing driver from session state."""
-        if 'neo4j_driver' not in st.session_state:
+        """Get the existing driver, connecting if needed."""
+        if self._driver is None:
             return self.connect()
-        return st.session_state.neo4j_driver
+        return self._driver
     
     def is_connected(self) -> bool:
-        """Check if connection is active."""
-        if 'neo4j_driver' not in st.session_state:
+        """Check if connection is active (cached for VERIFY_TTL_SECONDS)."""
+        if self._driver is None:
             return False
         
-        try:
-            driver = st.session_state.neo4j_driver
-            with driver.session() as session:
-                session.run("RETURN 1")
+        last_verified = self._last_verified
+        if last_verified and time.monotonic() - last_verified < VERIFY_TTL_SECONDS:
             return True
-        except:
-            return False
+        
+        driver = self._driver
+        try:
+            driver.verify_connectivity()
+        except Exception:
+            # Fall back to a real query before reporting disconnected
+            try:
+                with driver.session() as session:
+                    session.run("RETURN 1").consume()
+            except Exception:
+                self._last_verified = None
+                return False
+        
+        self._last_verified = time.monotonic()
+        return True
     
     def reconnect(self):
         """Reconnect to Neo4j."""
@@ -98,10 +124,11 @@ class Neo4jConnectionManager:
     
     def close(self):
         """Close Neo4j connection."""
-        if 'neo4j_driver' in st.session_state:
+        if self._driver is not None:
             try:
-                st.session_state.neo4j_driver.close()
-                del st.session_state.neo4j_driver
+                self._driver.close()
+                self._driver = None
+                self._last_verified = None
                 logger.info("Neo4j connection closed")
             except Exception as e:
                 logger.error(f"Error closing connection: {e}")
\ No newline at end of file
@@ -1,13 +1,15 @@
 """
 Entity extraction using spaCy.
 """
-import spacy
 import streamlit as st
-from typing import List, Dict
+from functools import cached_property
+from typing import TYPE_CHECKING, Iterable, List, Dict
 from config.config import NLP_CONFIG
+from core.nlp.model_cache import load_shared_nlp, pipes_to_disable, resolve_model
 from utils.logger import setup_logger
-from pathlib import Path
 
+if TYPE_CHECKING:
+    from spacy.tokens import Doc
 
 logger = setup_logger(__name__)
 
@@ -15,23 +17,25 @@ logger = setup_logger(__name__)
 class EntityExtractor:
     """Extract named entities from text using spaCy."""
     
-    def __init__(self):
-        """Initialize spaCy model."""
+    # Only tok2vec + ner are needed for doc.ents
+    ENABLED_PIPES = ["tok2vec", "ner"]
+    
+    @cached_property
+    def nlp(self):
+        """spaCy model, loaded on first use."""
+        model = resolve_model()
         try:
-            model_path: Path= Path(NLP_CONFIG['spacy_model_path'])
-            if model_path.exists():
-                st.info(f"📂 Loading spaCy model from: {model_path}")
-                self.nlp = spacy.load(str(model_path))
-                st.success("✅ Model loaded successfully from local directory!")
-                
+            if model != NLP_CONFIG["spacy_model"]:
+                logger.info(f"Loading spaCy model from: {model}")
             else:
                 # Fallback: try loading installed model
-                st.warning("⚠️ Local model not found, trying installed model...")
-                self.nlp = spacy.load("en_core_web_sm")
+                logger.warning("Local model not found, trying installed model...")
+            
+            return load_shared_nlp(model)
                 
         except Exception as e:
             st.error(f"❌ Failed to load spaCy model: {str(e)}")
-            st.info(f"Tried path: {model_path}")
+            st.info(f"Tried path: {NLP_CONFIG['spacy_model_path']}")
             st.stop()
 
     def extract_from_text(self, text: str) -> List[Dict[str, str]]:
@@ -41,7 +45,7 @@ class EntityExtractor:
         Returns:
             List of dicts with 'text', 'label', 'start', 'end'
         """
-        doc = self.nlp(text)
+        doc = self.nlp(text, disable=pipes_to_disable(self.nlp, self.ENABLED_PIPES))
         
         entities = []
         for ent in doc.ents:
@@ -58,25 +62,29 @@ class EntityExtractor:
         """
         Extract unique entities from multiple sentences.
         
+        Returns:
+            Dict mapping entity text to entity type
+        """
+        docs = self.nlp.pipe(
+            sentences,
+            batch_size=NLP_CONFIG["spacy_batch_size"],
+            disable=pipes_to_disable(self.nlp, self.ENABLED_PIPES)
+        )
+        
+        return self.extract_from_docs(docs)
+    
+    def extract_from_docs(self, docs: Iterable["Doc"]) -> Dict[str, str]:
+        """
+        Extract unique entities from already parsed docs.
+        
         Returns:
             Dict mapping entity text to entity type
         """
         entities = {}
         
-        for sentence in sentences:
-            doc = self.nlp(sentence)
+        for doc in docs:
             for ent in doc.ents:
                 if ent.text not in entities:
                     entities[ent.text] = ent.label_
         
         return entities
-    
-    def get_entities_in_sentence(self, sentence: str) -> List[tuple]:
-        """
-        Get entities in a single sentence.
-        
-        Returns:
-            List of (entity_text, entity_label) tuples
-        """
-        doc = self.nlp(sentence)
-        return [(ent.text, ent.label_) for ent in doc.ents]
\ No newline at end of file
@@ -0,0 +1,95 @@
+"""
+Locate known entity mentions in text for the relationship templates.
+"""
+import re
+from functools import lru_cache
+from typing import Dict, Iterator, List, Tuple
+
+# Max characters between two entity mentions for a template to link them
+PAIR_WINDOW = 80
+
+# (start, end, canonical entity name)
+Mention = Tuple[int, int, str]
+
+_WORD_CHAR = re.compile(r"\w")
+
+
+@lru_cache(maxsize=32)
+def compile_entity_finder(entity_names: Tuple[str, ...]) -> re.Pattern:
+    """
+    Compile one alternation regex that matches any entity as a whole word.
+
+    Cached per entity set, so reprocessing the same document reuses the
+    compiled pattern.
+
+    Args:
+        entity_names: Lowercased entity names, longest first
+    """
+    alternation = "|".join(re.escape(name) for name in entity_names)
+    return re.compile(rf"(?<!\w)(?:{alternation})(?!\w)")
+
+
+def build_entity_finder(entities: Dict[str, str]) -> Tuple[re.Pattern, Dict[str, str]]:
+    """
+    Build the finder for a set of entities, matched on lowercased text.
+
+    Returns:
+        (entity_finder, canonical_names) where canonical_names maps a
+        lowercased match back to the entity name
+    """
+    # Longest first so the longest entity at a position is tried first
+    canonical_names = {}
+    for name in sorted(entities, key=len, reverse=True):
+        canonical_names.setdefault(name.lower(), name)
+
+    return compile_entity_finder(tuple(canonical_names)), canonical_names
+
+
+def find_entity_mentions(
+    lower_text: str,
+    entity_finder: re.Pattern,
+    canonical_names: Dict[str, str]
+) -> List[Mention]:
+    """
+    Find every entity mention, including overlapping and nested ones.
+
+    An NER span such as "Grace Lee manages Apple" must not hide the
+    "Grace Lee" and "Apple" mentions inside it, so all entities starting
+    at each position are collected, not just the longest.
+
+    Returns:
+        Mentions ordered by start, longest first at the same start
+    """
+    mentions = []
+
+    match = entity_finder.search(lower_text)
+    while match:
+        start = match.start()
+
+        # Shorter entities at the same start: endpos hides the longer ones,
+        # so the word boundary after each candidate is checked on the full text
+        candidate = match
+        while candidate:
+            end = candidate.end()
+            if not _WORD_CHAR.match(lower_text, end):
+                mentions.append((start, end, canonical_names[candidate.group()]))
+            candidate = entity_finder.match(lower_text, start, end - 1) if end - 1 > start else None
+
+        match = entity_finder.search(lower_text, start + 1)
+
+    return mentions
+
+
+def iter_mention_pairs(mentions: List[Mention], max_gap: int = PAIR_WINDOW) -> Iterator[Tuple[Mention, Mention]]:
+    """
+    Yield (source, target) pairs of distinct entities where the target
+    starts after the source ends, at most max_gap characters later.
+    """
+    for i, source in enumerate(mentions):
+        _, source_end, source_entity = source
+        for target in mentions[i + 1:]:
+            gap = target[0] - source_end
+            if gap > max_gap:
+                break
+            if gap >= 0 and target[2] != source_entity:
+                yield source, target
@@ -1,5 +1,7 @@
 """NLP package."""
 from .entity_extractor import EntityExtractor
 from .relationship_extractor import RelationshipExtractor
+from .pipeline import NLPPipeline
+from .model_cache import load_shared_nlp, pipes_to_disable, resolve_model
 
-__all__ = ['EntityExtractor', 'RelationshipExtractor']
\ No newline at end of file
+__all__ = ['EntityExtractor', 'RelationshipExtractor', 'NLPPipeline', 'load_shared_nlp', 'pipes_to_disable', 'resolve_model']
\ No newline at end of file
@@ -0,0 +1,67 @@
+"""
+Shared spaCy model cache.
+"""
+import streamlit as st
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterable, List
+from config.config import NLP_CONFIG
+from utils.logger import setup_logger
+
+if TYPE_CHECKING:
+    from spacy.language import Language
+
+logger = setup_logger(__name__)
+
+
+def resolve_model() -> str:
+    """Get local model path if it exists, otherwise the installed model name."""
+    model_path = Path(NLP_CONFIG["spacy_model_path"])
+    if model_path.exists():
+        return str(model_path)
+    return NLP_CONFIG["spacy_model"]
+
+
+@st.cache_resource(show_spinner=False)
+def load_shared_nlp(model: str) -> "Language":
+    """
+    Load a spaCy pipeline once per process and share it across extractors.
+    
+    The full pipeline is loaded; callers disable the components they
+    don't need per call (see pipes_to_disable).
+    
+    Args:
+        model: Local model path or installed model name
+    
+    Returns:
+        Loaded spaCy Language
+    """
+    # Imported lazily so CSV/JSON uploads never pay for importing spaCy
+    import spacy
+    
+    logger.info(f"Loading spaCy model: {model}")
+    try:
+        return spacy.load(model)
+    except OSError:
+        if model != NLP_CONFIG["spacy_model"]:
+            raise
+        
+        # Installed model missing - download it
+        import subprocess
+        import sys
+        subprocess.run([sys.executable, "-m", "spacy", "download", model])
+        return spacy.load(model)
+
+
+def pipes_to_disable(nlp: "Language", enable: Iterable[str]) -> List[str]:
+    """
+    Get the components to pass as nlp.pipe(..., disable=...) so only enable runs.
+    
+    Used instead of nlp.select_pipes, which toggles components on the
+    shared pipeline and would affect concurrent sessions.
+    
+    Args:
+        nlp: Loaded spaCy Language
+        enable: Component names the caller needs
+    """
+    enable = set(enable)
+    return [name for name in nlp.pipe_names if name not in enable]
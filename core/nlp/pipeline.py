@@ -0,0 +1,72 @@
+"""
+Single-pass NLP pipeline for entity and relationship extraction.
+"""
+import pandas as pd
+from typing import List, Dict, Tuple
+from config.config import NLP_CONFIG
+from core.nlp.entity_extractor import EntityExtractor
+from core.nlp.relationship_extractor import RelationshipExtractor
+from core.nlp.model_cache import pipes_to_disable
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+class NLPPipeline:
+    """Parse sentences once and extract both entities and relationships from the same Docs."""
+
+    def __init__(
+        self,
+        entity_extractor: EntityExtractor = None,
+        relationship_extractor: RelationshipExtractor = None,
+        n_process: int = None
+    ):
+        """
+        Initialize pipeline.
+
+        Args:
+            entity_extractor: Extractor for named entities
+            relationship_extractor: Extractor for dependency relationships
+            n_process: Worker processes for nlp.pipe on large inputs
+        """
+        self.entity_extractor = entity_extractor or EntityExtractor()
+        self.relationship_extractor = relationship_extractor or RelationshipExtractor()
+        self.n_process = n_process or NLP_CONFIG["spacy_n_process"]
+
+    @property
+    def nlp(self):
+        """Shared spaCy model (loaded through EntityExtractor for its UI error handling)."""
+        return self.entity_extractor.nlp
+
+    def run(self, sentences: List[str]) -> Tuple[Dict[str, str], pd.DataFrame]:
+        """
+        Run one nlp.pipe pass over all sentences.
+
+        Args:
+            sentences: List of sentences to process
+
+        Returns:
+            (entities, relationships) - entity_text -> entity_type dict and
+            the dependency relationship DataFrame
+        """
+        enable = set(self.entity_extractor.ENABLED_PIPES) | set(self.relationship_extractor.ENABLED_PIPES)
+
+        # Multiprocessing only helps on large inputs
+        n_process = 1
+        if len(sentences) >= NLP_CONFIG["spacy_multiprocess_min_sentences"]:
+            n_process = self.n_process
+
+        # Docs are kept so relationships reuse the parse instead of reparsing
+        docs = list(self.nlp.pipe(
+            sentences,
+            batch_size=NLP_CONFIG["spacy_batch_size"],
+            disable=pipes_to_disable(self.nlp, enable),
+            n_process=n_process
+        ))
+
+        entities = self.entity_extractor.extract_from_docs(docs)
+        logger.info(f"Found {len(entities)} unique entities")
+
+        relationships = self.relationship_extractor.extract_from_docs(sentences, docs, entities)
+
+        return entities, relationships
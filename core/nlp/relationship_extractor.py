@@ -2,35 +2,103 @@
 Relationship extraction using dependency parsing.
 """
 import re
-from typing_extensions import Doc
-import spacy
-from typing import List, Dict
+import pandas as pd
+from functools import cached_property, lru_cache
+from typing import TYPE_CHECKING, Iterable, List, Dict, Tuple
 from config.config import NLP_CONFIG
+from core.nlp.model_cache import load_shared_nlp, pipes_to_disable, resolve_model
+from core.nlp.entity_mentions import build_entity_finder, find_entity_mentions, iter_mention_pairs
 from utils.logger import setup_logger
 
+try:
+    import hyperscan
+except ImportError:
+    # Optional: single-pass prefilter for the entity pattern templates
+    hyperscan = None
+
+if TYPE_CHECKING:
+    from spacy.tokens import Doc
+
 logger = setup_logger(__name__)
 
 
+# Text between source and target entity for each relationship type
+ENTITY_PATTERN_TEMPLATES = [
+    # Ownership and founding
+    (r'\s+owns?\s+', 'OWNS'),
+    (r'\s+(?:founded|established|created)\s+', 'FOUNDED'),
+    
+    # Employment
+    (r'\s+works?\s+(?:at|for)\s+', 'WORKS_AT'),
+    (r'\s+(?:is|was)\s+(?:a|an|the)?\s*(?:employee|engineer|developer|manager|director|ceo|cto|founder)\s+(?:at|of)\s+', 'WORKS_AT'),
+    
+    # Management
+    (r'\s+(?:manages?|leads?|heads?|runs?|oversees?)\s+(?:the\s+)?', 'MANAGES'),
+    (r'\s+(?:is|was)\s+(?:a|an|the)?\s*(?:manager|director|head|leader)\s+of\s+', 'MANAGES'),
+    
+    # Reporting
+    (r'\s+reports?\s+to\s+', 'REPORTS_TO'),
+    
+    # Collaboration
+    (r'\s+(?:collaborates?|works?|partners?)\s+with\s+', 'COLLABORATES_WITH'),
+    (r'\s+(?:coordinates?|cooperates?)\s+with\s+', 'COORDINATES_WITH'),
+    
+    # Products/Services
+    (r'\s+(?:has|produces?|manufactures?|makes?|develops?|offers?|provides?)\s+', 'PRODUCES'),
+    (r'\s+(?:sells?|markets?)\s+', 'SELLS'),
+    
+    # Location
+    (r'\s+(?:is\s+)?(?:located|based|headquartered)\s+(?:in|at)\s+', 'LOCATED_IN'),
+    (r'\s+(?:has\s+)?(?:offices?|branches?)\s+(?:in|at)\s+', 'HAS_OFFICE_IN'),
+    
+    # Employment history
+    (r'\s+(?:hired|employed|recruited)\s+', 'HIRED'),
+    (r'\s+(?:interned?|worked)\s+(?:at|for|under)\s+', 'INTERNED_AT'),
+    
+    # Relationships
+    (r'\s+(?:is|are)\s+(?:friends?|colleagues?)\s+(?:with|of)\s+', 'FRIEND_WITH'),
+    
+    # Events
+    (r'\s+(?:attended|participated in|joined)\s+', 'ATTENDED'),
+    (r'\s+(?:worked on|participated in)\s+(?:a\s+)?(?:project|initiative)\s+(?:with\s+)?', 'WORKED_WITH'),
+]
+
+
+# Connector templates, matched against the lowercased text between two mentions
+CONNECTOR_PATTERNS = [(re.compile(connector), rel_type) for connector, rel_type in ENTITY_PATTERN_TEMPLATES]
+
+
+# Columns of the relationship DataFrame; low-cardinality ones are categorical
+RELATIONSHIP_COLUMNS = ["source", "relationship", "target", "sentence", "source_type", "target_type"]
+CATEGORY_COLUMNS = ["source", "relationship", "target", "source_type", "target_type"]
+
+
 class RelationshipExtractor:
     """Extract relationships between entities using spaCy."""
-    def __init__(self):
-        """Initialize spaCy model."""
     
-        try:
-            self.nlp = spacy.load(NLP_CONFIG["spacy_model"])
-        except OSError:
-            import subprocess
-            import sys
-            subprocess.run([sys.executable, "-m", "spacy", "download", NLP_CONFIG["spacy_model"]])
-            self.nlp = spacy.load(NLP_CONFIG["spacy_model"])
+    # POS tags, dependencies and lemmas drive the verb/prep extraction
+    ENABLED_PIPES = ["tok2vec", "tagger", "parser", "attribute_ruler", "lemmatizer"]
+    
+    def __init__(self, n_process: int = None):
+        """
+        Initialize extractor.
         
+        Args:
+            n_process: Worker processes for nlp.pipe on large inputs
+        """
+        self.n_process = n_process or NLP_CONFIG["spacy_n_process"]
+    
+    @cached_property
+    def nlp(self):
+        """spaCy model (shared with EntityExtractor), loaded on first use."""
+        return load_shared_nlp(resolve_model())
     
     
     def extract_from_sentences(
         self,
         sentences: List[str],
         known_entities: Dict[str, str] = None
-    ) -> List[Dict]:
+    ) -> pd.DataFrame:
         """
         Extract relationships from sentences.
         
@@ -39,106 +107,179 @@ class RelationshipExtractor:
             known_entities: Dict of entity_text -> entity_type
         
         Returns:
-            List of relationship dicts with source, target, relationship, etc.
+            DataFrame of unique (source, relationship, target) rows with
+            sentence and entity type columns
         """
-        relationships = []
+        # Run NER only when the caller has no entity types to supply
+        enable = self.ENABLED_PIPES if known_entities else self.ENABLED_PIPES + ["ner"]
+        disable = pipes_to_disable(self.nlp, enable)
 
+        # Multiprocessing only helps on large inputs
+        n_process = 1
+        if len(sentences) >= NLP_CONFIG["spacy_multiprocess_min_sentences"]:
+            n_process = self.n_process
+
+        # Batch sentences through spaCy instead of parsing them one by one
+        docs = self.nlp.pipe(
+            sentences,
+            batch_size=NLP_CONFIG["spacy_batch_size"],
+            disable=disable,
+            n_process=n_process
+        )
+        
+        return self.extract_from_docs(sentences, docs, known_entities)
+    
+    def extract_from_docs(
+        self,
+        sentences: List[str],
+        docs: Iterable["Doc"],
+        known_entities: Dict[str, str] = None
+    ) -> pd.DataFrame:
+        """
+        Extract relationships from already parsed sentences.
+        
+        Args:
+            sentences: Sentences, in the same order as docs
+            docs: spaCy Docs with at least ENABLED_PIPES applied
+            known_entities: Dict of entity_text -> entity_type
+        
+        Returns:
+            DataFrame of unique (source, relationship, target) rows with
+            sentence and entity type columns
+        """
+        relationships = []
         
-        for sentence in sentences:
-            doc :Doc= self.nlp(sentence)
+        # Compile the entity finder once for all sentences; matching runs
+        # case-sensitively on lowercased text
+        entity_finder = None
+        prefilter = None
+        canonical_names = {}
+        if known_entities:
+            entity_finder, canonical_names = build_entity_finder(known_entities)
+            prefilter = self._compile_prefilter()
+        
+        lower_sentences = [sentence.lower() for sentence in sentences]
+        
+        # Normalized entity lookup for the prepositional pass
+        entities_norm = {
+            name.lower().strip(): (name, entity_type)
+            for name, entity_type in (known_entities or {}).items()
+        }
+        
+        for sentence, lower_sentence, doc in zip(sentences, lower_sentences, docs):
+            # Resolve noun chunks and entity labels once per doc
+            chunk_map, ent_map = self._build_token_maps(doc)
             
             # Method 1: Entity-aware pattern matching (BEST for accuracy)
-            pattern_rels = self._extract_entity_patterns(sentence, known_entities)
+            pattern_rels = self._extract_entity_patterns(
+                sentence, lower_sentence, known_entities, entity_finder, canonical_names, prefilter
+            )
             relationships.extend(pattern_rels)
 
             # Method 2: Dependency parsing with verb mapping
-            verb_rels = self._extract_verb_relationships(doc, known_entities)
+            verb_rels = self._extract_verb_relationships(
+                doc, sentence, chunk_map, ent_map, known_entities
+            )
             relationships.extend(verb_rels)
 
             # Method 3: Prepositional relationships
-            prep_rels = self._extract_prep_relationships(doc,sentence, known_entities)
+            prep_rels = self._extract_prep_relationships(doc, sentence, chunk_map, entities_norm)
             relationships.extend(prep_rels)
         
-        return relationships
+        df = pd.DataFrame(relationships, columns=RELATIONSHIP_COLUMNS)
+        df = df.drop_duplicates(subset=["source", "relationship", "target"])
+        
+        return df.astype({col: "category" for col in CATEGORY_COLUMNS})
     
     
     # ---- ENTITY PATTERN EXTRACTION METHODS ----
-    def _extract_entity_patterns(self, sentence: str, all_entities: dict) -> list:
+    @staticmethod
+    @lru_cache(maxsize=1)
+    def _compile_prefilter():
+        """
+        Compile the template connectors into one Hyperscan database.
+        
+        A template can only match if its connector occurs in the sentence,
+        so one scan tells which templates are worth running through re.
+        Entity names are left out, which keeps the database independent of
+        the entity set and within Hyperscan's pattern length limit.
+        
+        Returns:
+            hyperscan.Database, or None if hyperscan is unavailable
+        """
+        if hyperscan is None:
+            return None
+        
+        expressions = [connector.encode("utf-8") for connector, _ in ENTITY_PATTERN_TEMPLATES]
+        
+        try:
+            db = hyperscan.Database()
+            db.compile(
+                expressions=expressions,
+                ids=list(range(len(expressions))),
+                elements=len(expressions),
+                flags=[hyperscan.HS_FLAG_SINGLEMATCH | hyperscan.HS_FLAG_UTF8] * len(expressions)
+            )
+            return db
+        except hyperscan.error as e:
+            logger.warning(f"Hyperscan prefilter unavailable, using re only: {e}")
+            return None
+    
+    def _extract_entity_patterns(
+        self,
+        sentence: str,
+        lower_sentence: str,
+        all_entities: dict,
+        entity_finder: re.Pattern,
+        canonical_names: Dict[str, str],
+        prefilter=None
+    ) -> list:
         """Extract patterns using actual entity names (handles multi-word entities)."""
         relationships = []
+        if entity_finder is None:
+            return relationships
         
-        # Create entity list sorted by length (longest first to avoid partial matches)
-        entity_names = sorted(all_entities.keys(), key=len, reverse=True)
+        # Presence index: a template needs two mentions in the sentence
+        mentions = find_entity_mentions(lower_sentence, entity_finder, canonical_names)
+        if len(mentions) < 2:
+            return relationships
         
-        # Escape special regex characters in entity names
-        def escape_entity(name):
-            return re.escape(name)
+        connectors = CONNECTOR_PATTERNS
+        if prefilter is not None:
+            # Keep only the templates whose connector occurs in the sentence
+            matched_ids = set()
+            prefilter.scan(
+                lower_sentence.encode("utf-8"),
+                match_event_handler=lambda pattern_id, start, end, flags, context: matched_ids.add(pattern_id)
+            )
+            connectors = [CONNECTOR_PATTERNS[i] for i in sorted(matched_ids)]
         
-        # Build patterns dynamically with actual entity names
-        for source_entity in entity_names:
-            for target_entity in entity_names:
-                if source_entity == target_entity:
+        # A connector must span exactly the text between two mentions
+        for (_, source_end, source_entity), (target_start, _, target_entity) in iter_mention_pairs(mentions):
+            for connector, rel_type in connectors:
+                if not connector.fullmatch(lower_sentence, source_end, target_start):
                     continue
                 
-                source_escaped = escape_entity(source_entity)
-                target_escaped = escape_entity(target_entity)
-                
-                # Define relationship patterns
-                patterns = [
-                    # Ownership and founding
-                    (rf'{source_escaped}\s+owns?\s+{target_escaped}', 'OWNS'),
-                    (rf'{source_escaped}\s+(?:founded|established|created)\s+{target_escaped}', 'FOUNDED'),
-                    
-                    # Employment
-                    (rf'{source_escaped}\s+works?\s+(?:at|for)\s+{target_escaped}', 'WORKS_AT'),
-                    (rf'{source_escaped}\s+(?:is|was)\s+(?:a|an|the)?\s*(?:employee|engineer|developer|manager|director|ceo|cto|founder)\s+(?:at|of)\s+{target_escaped}', 'WORKS_AT'),
-                    
-                    # Management
-                    (rf'{source_escaped}\s+(?:manages?|leads?|heads?|runs?|oversees?)\s+(?:the\s+)?{target_escaped}', 'MANAGES'),
-                    (rf'{source_escaped}\s+(?:is|was)\s+(?:a|an|the)?\s*(?:manager|director|head|leader)\s+of\s+{target_escaped}', 'MANAGES'),
-                    
-                    # Reporting
-                    (rf'{source_escaped}\s+reports?\s+to\s+{target_escaped}', 'REPORTS_TO'),
-                    
-                    # Collaboration
-                    (rf'{source_escaped}\s+(?:collaborates?|works?|partners?)\s+with\s+{target_escaped}', 'COLLABORATES_WITH'),
-                    (rf'{source_escaped}\s+(?:coordinates?|cooperates?)\s+with\s+{target_escaped}', 'COORDINATES_WITH'),
-                    
-                    # Products/Services
-                    (rf'{source_escaped}\s+(?:has|produces?|manufactures?|makes?|develops?|offers?|provides?)\s+{target_escaped}', 'PRODUCES'),
-                    (rf'{source_escaped}\s+(?:sells?|markets?)\s+{target_escaped}', 'SELLS'),
-                    
-                    # Location
-                    (rf'{source_escaped}\s+(?:is\s+)?(?:located|based|headquartered)\s+(?:in|at)\s+{target_escaped}', 'LOCATED_IN'),
-                    (rf'{source_escaped}\s+(?:has\s+)?(?:offices?|branches?)\s+(?:in|at)\s+{target_escaped}', 'HAS_OFFICE_IN'),
-                    
-                    # Employment history
-                    (rf'{source_escaped}\s+(?:hired|employed|recruited)\s+{target_escaped}', 'HIRED'),
-                    (rf'{source_escaped}\s+(?:interned?|worked)\s+(?:at|for|under)\s+{target_escaped}', 'INTERNED_AT'),
-                    
-                    # Relationships
-                    (rf'{source_escaped}\s+(?:is|are)\s+(?:friends?|colleagues?)\s+(?:with|of)\s+{target_escaped}', 'FRIEND_WITH'),
-                    
-                    # Events
-                    (rf'{source_escaped}\s+(?:attended|participated in|joined)\s+{target_escaped}', 'ATTENDED'),
-                    (rf'{source_escaped}\s+(?:worked on|participated in)\s+(?:a\s+)?(?:project|initiative)\s+(?:with\s+)?{target_escaped}', 'WORKED_WITH'),
-                ]
-                
-                for pattern, rel_type in patterns:
-                    if re.search(pattern, sentence, re.IGNORECASE):
-                        relationships.append({
-                            "source": source_entity,
-                            "relationship": rel_type,
-                            "target": target_entity,
-                            "sentence": sentence,
-                            "source_type": all_entities.get(source_entity, "Entity"),
-                            "target_type": all_entities.get(target_entity, "Entity")
-                        })
+                relationships.append({
+                    "source": source_entity,
+                    "relationship": rel_type,
+                    "target": target_entity,
+                    "sentence": sentence,
+                    "source_type": all_entities.get(source_entity, "Entity"),
+                    "target_type": all_entities.get(target_entity, "Entity")
+                })
         
         return relationships
     
     # ---- VERB RELATION EXTRACTION METHODS ----
-    def _extract_verb_relationships(self, doc:Doc, sentence: str) -> List[Dict]:
+    def _extract_verb_relationships(
+        self,
+        doc: "Doc",
+        sentence: str,
+        chunk_map: List[str],
+        ent_map: List[str],
+        known_entities: Dict[str, str] = None
+    ) -> List[Dict]:
         """Extract relationships based on verb dependencies."""
         relationships = []
         
@@ -155,39 +296,78 @@ class RelationshipExtractor:
                 # Create relationships
                 for subj in subjects:
                     for obj in objects:
-                        subj_text = self._get_noun_phrase(subj)
-                        obj_text = self._get_noun_phrase(obj)
+                        subj_text = self._get_noun_phrase(subj, chunk_map)
+                        obj_text = self._get_noun_phrase(obj, chunk_map)
                         
                         relationships.append({
                             "source": subj_text,
                             "relationship": token.lemma_.upper().replace(" ", "_"),
                             "target": obj_text,
                             "sentence": sentence,
-                            "source_type": self._get_entity_type(subj),
-                            "target_type": self._get_entity_type(obj)
+                            "source_type": self._get_entity_type(subj, chunk_map, ent_map, known_entities),
+                            "target_type": self._get_entity_type(obj, chunk_map, ent_map, known_entities)
                         })
         
         return relationships
     
     
-    def _get_noun_phrase(self, token) -> str:
+    @staticmethod
+    def _build_token_maps(doc: "Doc") -> Tuple[List[str], List[str]]:
+        """
+        Map each token index to its noun chunk text and entity label.
+        
+        Returns:
+            (chunk_map, ent_map), with None for tokens outside any chunk/entity
+        """
+        chunk_map = [None] * len(doc)
+        for chunk in doc.noun_chunks:
+            for i in range(chunk.start, chunk.end):
+                chunk_map[i] = chunk.text
+        
+        ent_map = [None] * len(doc)
+        for ent in doc.ents:
+            for i in range(ent.start, ent.end):
+                ent_map[i] = ent.label_
+        
+        return chunk_map, ent_map
+    
+    
+    def _get_noun_phrase(self, token, chunk_map: List[str]) -> str:
         """Extract full noun phrase from token."""
-        for chunk in token.doc.noun_chunks:
-            if token in chunk:
-                return chunk.text
-        return token.text
+        return chunk_map[token.i] or token.text
     
     
-    def _get_entity_type(self, token) -> str:
+    def _get_entity_type(
+        self,
+        token,
+        chunk_map: List[str],
+        ent_map: List[str],
+        known_entities: Dict[str, str] = None
+    ) -> str:
         """Get entity type if token is part of an entity."""
-        for ent in token.doc.ents:
-            if token in ent:
-                return ent.label_
+        if ent_map[token.i]:
+            return ent_map[token.i]
+        
+        # NER was skipped for this doc - resolve the type from known entities
+        if known_entities:
+            noun_phrase = self._get_noun_phrase(token, chunk_map)
+            return known_entities.get(noun_phrase, known_entities.get(token.text, "Entity"))
         return "Entity"
 
 
-    def _extract_prep_relationships(self, doc:Doc, sentence: str, all_entities: dict) -> list:
-        """Extract prepositional relationships."""
+    def _extract_prep_relationships(
+        self,
+        doc: "Doc",
+        sentence: str,
+        chunk_map: List[str],
+        entities_norm: Dict[str, Tuple[str, str]]
+    ) -> list:
+        """
+        Extract prepositional relationships.
+        
+        Args:
+            entities_norm: Lowercased, stripped entity text -> (entity_text, entity_type)
+        """
         relationships = []
         
         for token in doc:
@@ -200,16 +380,18 @@ class RelationshipExtractor:
                         break
                 
                 if pobj:
-                    head_text = self._get_noun_phrase(token.head)
-                    obj_text = self._get_noun_phrase(pobj)
+                    head = entities_norm.get(self._get_noun_phrase(token.head, chunk_map).lower().strip())
+                    obj = entities_norm.get(self._get_noun_phrase(pobj, chunk_map).lower().strip())
                     
                     # Only proceed if both are known entities
-                    if head_text not in all_entities or obj_text not in all_entities:
+                    if head is None or obj is None:
                         continue
                     
-                    if head_text.lower() == obj_text.lower():
+                    if head is obj:
                         continue
                     
+                    (head_text, head_type), (obj_text, obj_type) = head, obj
+                    
                     rel_name = self._map_preposition_to_relationship(token.text, token.head.pos_)
                     
                     relationships.append({
@@ -217,8 +399,8 @@ class RelationshipExtractor:
                         "relationship": rel_name,
                         "target": obj_text,
                         "sentence": sentence,
-                        "source_type": all_entities.get(head_text, "Entity"),
-                        "target_type": all_entities.get(obj_text, "Entity")
+                        "source_type": head_type,
+                        "target_type": obj_type
                     })
         
         return relationships
@@ -1,47 +1,79 @@
 """
 CSV file processor.
 """
+import time
 import streamlit as st
 import pandas as pd
-import numpy as np
-from typing import Tuple, Dict
+from typing import Callable, Dict, List, Optional, Tuple
 
+from config.config import FILE_CONFIG
 from core.processor.base_processor import BaseProcessor
 from utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
 
+def _throttled(progress_fn: Callable[[int], None], min_interval: float = 0.1) -> Callable[[int], None]:
+    """
+    Wrap a progress callback so updates are sent at most every min_interval seconds.
+    
+    Completion (100) is always forwarded.
+    """
+    last_sent = None
+    
+    def update(value: int) -> None:
+        nonlocal last_sent
+        now = time.monotonic()
+        if value >= 100 or last_sent is None or now - last_sent >= min_interval:
+            last_sent = now
+            progress_fn(value)
+    
+    return update
+
+
 class CSVProcessor(BaseProcessor):
     """Processor for CSV files."""
     
+    NULL_TOKENS = ["nan", "NaN", "null", "NULL", ""]
+    
     def process(self) -> Tuple[pd.DataFrame, Dict]:
         """Process CSV file."""
         progress_bar = st.progress(0)
+        progress = _throttled(progress_bar.progress)
         status_text = st.empty()
         
         try:
             status_text.text("📄 Reading CSV file...")
-            progress_bar.progress(20)
+            progress(20)
             
-            # Read CSV with error handling
-            try:
-                df = pd.read_csv(self.file, encoding='utf-8')
-            except UnicodeDecodeError:
-                # Try different encoding if UTF-8 fails
-                self.file.seek(0)
-                df = pd.read_csv(self.file, encoding='latin-1')
+            if self.file.size >= FILE_CONFIG["csv_stream_min_mb"] * 1024 * 1024:
+                # Large file - parse in row chunks to bound parser memory
+                status_text.text("📄 Streaming CSV file in chunks...")
+                try:
+                    df = self._read_csv_chunked('utf-8', progress)
+                except UnicodeDecodeError:
+                    self.file.seek(0)
+                    df = self._read_csv_chunked('latin-1', progress)
+            else:
+                # Read CSV with error handling
+                try:
+                    df = self._read_csv(encoding='utf-8')
+                except UnicodeDecodeError:
+                    # Try different encoding if UTF-8 fails
+                    self.file.seek(0)
+                    df = self._read_csv(encoding='latin-1')
+                
+                progress(60)
+                
+                # Clean data
+                status_text.text("🧹 Cleaning data...")
+                df = self._clean_dataframe(df)
             
-            progress_bar.progress(60)
-            
-            # Clean data
-            status_text.text("🧹 Cleaning data...")
-            df = self._clean_dataframe(df)
-            progress_bar.progress(80)
+            progress(80)
             
             # Generate summary
             summary = self._generate_summary(df)
-            progress_bar.progress(100)
+            progress(100)
             
             status_text.text("✅ CSV processing complete!")
             progress_bar.empty()
@@ -55,41 +87,121 @@ class CSVProcessor(BaseProcessor):
             status_text.empty()
             raise ValueError(f"Failed to process CSV: {e}")
     
+    def _read_csv(self, encoding: str) -> pd.DataFrame:
+        """Read CSV with the multithreaded pyarrow engine, falling back to the C engine."""
+        try:
+            df = pd.read_csv(self.file, encoding=encoding, engine="pyarrow")
+        except ImportError:
+            self.file.seek(0)
+            return pd.read_csv(self.file, encoding=encoding)
+        
+        temporal = list(df.select_dtypes(include=["datetime", "datetimetz"]).columns)
+        for col in df.columns[df.dtypes == object]:
+            inferred = pd.api.types.infer_dtype(df[col], skipna=True)
+            
+            # pyarrow returns undecodable text as bytes instead of raising
+            if inferred == "bytes":
+                raise UnicodeDecodeError(encoding, b"", 0, 1, f"invalid {encoding} text in column '{col}'")
+            if inferred in ("date", "time"):
+                temporal.append(col)
+        
+        if temporal:
+            # pyarrow parses ISO dates, times and timestamps, which the C engine
+            # (and so the chunked path) keeps as text; node names are built from
+            # str(value), so take these columns' source text from the C engine
+            self.file.seek(0)
+            text = pd.read_csv(self.file, encoding=encoding, usecols=temporal)
+            for col in temporal:
+                df[col] = text[col]
+        
+        return df
+    
+    def _read_csv_chunked(self, encoding: str, progress: Callable[[int], None]) -> pd.DataFrame:
+        """Read a large CSV in row chunks, updating progress per chunk, then clean it once."""
+        df, mixed = self._concat_chunks(encoding, progress)
+        
+        if mixed:
+            # Chunks inferred different types for these columns; a single read
+            # keeps them as text, so read them as text in every chunk
+            logger.info(f"Re-reading mixed-type CSV columns as text: {mixed}")
+            self.file.seek(0)
+            df, _ = self._concat_chunks(encoding, progress, dtype=dict.fromkeys(mixed, str))
+        
+        # Cleaned after concatenation so null tokens and dtypes are normalized
+        # across chunk boundaries exactly as for a single read
+        return self._clean_dataframe(df)
+    
+    def _concat_chunks(
+        self,
+        encoding: str,
+        progress: Callable[[int], None],
+        dtype: Dict[str, type] = None
+    ) -> Tuple[pd.DataFrame, List[str]]:
+        """
+        Parse the CSV in row chunks and concatenate them.
+        
+        Returns:
+            (df, mixed) where mixed lists the columns whose non-null chunks
+            were inferred as different kinds of values (e.g. integer and string)
+        """
+        total_bytes = max(self.file.size, 1)
+        chunks = pd.read_csv(
+            self.file,
+            encoding=encoding,
+            chunksize=FILE_CONFIG["csv_chunk_rows"],
+            engine="c",
+            dtype=dtype
+        )
+        
+        parts = []
+        kinds: Dict[str, set] = {}
+        for chunk in chunks:
+            for col in chunk.columns:
+                kind = self._value_kind(chunk[col])
+                if kind is not None:
+                    kinds.setdefault(col, set()).add(kind)
+            parts.append(chunk)
+            progress(20 + int(60 * min(self.file.tell() / total_bytes, 1.0)))
+        
+        mixed = [col for col, col_kinds in kinds.items() if len(col_kinds) > 1]
+        return pd.concat(parts, ignore_index=True), mixed
+    
+    @staticmethod
+    def _value_kind(series: pd.Series) -> Optional[str]:
+        """Kind of values the parser produced for a chunk column (None if all null)."""
+        if series.isna().all():
+            return None
+        
+        inferred = pd.api.types.infer_dtype(series, skipna=True)
+        if inferred in ("integer", "floating", "mixed-integer-float"):
+            return "numeric"
+        return inferred
+    
     def _clean_dataframe(self, df: pd.DataFrame) -> pd.DataFrame:
         """Clean DataFrame for Neo4j compatibility."""
-        # Replace various null representations with None
-        df = df.replace({
-            np.nan: None,
-            'nan': None,
-            'NaN': None,
-            'null': None,
-            'NULL': None,
-            '': None
-        })
+        # Replace null representations with None in text columns only; numeric
+        # NaN is left as-is and skipped when properties are written to Neo4j
+        text_cols = df.select_dtypes(include=["object", "string"]).columns
+        for col in text_cols:
+            values = df[col].astype(object)
+            values = values.mask(values.isna() | values.isin(self.NULL_TOKENS), None)
+            df[col] = self._safe_strip_strings(values)
         
         # Clean column names - safely handle all column types
         df.columns = [str(col).strip().replace(' ', '_') for col in df.columns]
         
-        # Clean values in each column
-        for col in df.columns:
-            # Only process object (string) columns
-            if df[col].dtype == 'object':
-                df[col] = self._safe_strip_strings(df[col])
-        
         return df
     
     def _safe_strip_strings(self, series: pd.Series) -> pd.Series:
-        """Safely strip strings from a pandas Series."""
-        def strip_if_string(val):
-            if val is None or pd.isna(val):
-                return None
-            if isinstance(val, str):
-                stripped = val.strip()
-                # Return None for empty strings
-                return stripped if stripped else None
-            return val
+        """Strip strings in a pandas Series (vectorized), mapping empty ones to None."""
+        if pd.api.types.infer_dtype(series, skipna=True) == "string":
+            stripped = series.str.strip()
+        else:
+            # Mixed column - strip only the actual strings
+            is_str = series.map(type).eq(str)
+            stripped = series.where(~is_str, series[is_str].str.strip())
         
-        return series.apply(strip_if_string)
+        return stripped.mask(stripped.isna() | stripped.eq(""), None)
     
     def get_graph_name(self) -> str:
         """Get graph name from CSV data if possible."""
@@ -9,6 +9,11 @@ from typing import Tuple, Dict
 from core.processor.base_processor import BaseProcessor
 from utils.logger import setup_logger
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = setup_logger(__name__)
 
 
@@ -24,24 +29,26 @@ class JSONProcessor(BaseProcessor):
             status_text.text("📄 Reading JSON file...")
             progress_bar.progress(20)
             
-            # Try reading as JSON
-            try:
-                df = pd.read_json(self.file)
-                progress_bar.progress(50)
-            except ValueError:
-                # If that fails, try loading and normalizing
-                self.file.seek(0)
-                data = json.load(self.file)
-                progress_bar.progress(40)
-                
-                if isinstance(data, list):
-                    df = pd.json_normalize(data)
-                elif isinstance(data, dict):
-                    df = pd.json_normalize(data, sep='_')
+            data = self._load_json()
+            progress_bar.progress(40)
+            
+            if isinstance(data, list):
+                if self._is_flat_records(data):
+                    # Nothing to flatten - skip json_normalize
+                    df = pd.DataFrame(data)
                 else:
-                    raise ValueError("Unsupported JSON structure")
-                
-                progress_bar.progress(60)
+                    df = pd.json_normalize(data, sep='_')
+            elif isinstance(data, dict):
+                try:
+                    # Dict of columns
+                    df = pd.DataFrame(data)
+                except ValueError:
+                    # Single record of scalars
+                    df = pd.json_normalize(data, sep='_')
+            else:
+                raise ValueError("Unsupported JSON structure")
+            
+            progress_bar.progress(60)
             
             # Clean data
             status_text.text("🧹 Cleaning data...")
@@ -64,14 +71,37 @@ class JSONProcessor(BaseProcessor):
             status_text.empty()
             raise ValueError(f"Failed to process JSON: {e}")
     
+    def _load_json(self):
+        """Parse the uploaded file, using orjson when it is installed."""
+        if orjson is None:
+            return json.load(self.file)
+        
+        raw = self.file.read()
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            # stdlib also accepts NaN/Infinity literals and UTF-16/32 input
+            return json.loads(raw)
+    
+    @staticmethod
+    def _is_flat_records(data: list) -> bool:
+        """Check that no record holds a nested object (lists are kept as cell values)."""
+        return not any(
+            isinstance(value, dict)
+            for record in data if isinstance(record, dict)
+            for value in record.values()
+        )
+    
     def _clean_dataframe(self, df: pd.DataFrame) -> pd.DataFrame:
         """Clean DataFrame for Neo4j compatibility."""
-        import numpy as np
-        
-        # Replace NaN with None
-        df = df.replace({np.nan: None})
+        # Replace NaN with None in object/string columns; numeric NaN is
+        # skipped when properties are written to Neo4j
+        text_cols = df.select_dtypes(include=["object", "string"]).columns
+        for col in text_cols:
+            values = df[col].astype(object)
+            df[col] = values.where(values.notna(), None)
         
         # Clean column names
-        df.columns = df.columns.str.strip().str.replace('.', '_')
+        df.columns = [str(col).strip().replace('.', '_') for col in df.columns]
         
-        return df
\ No newline at end of file
+        return df
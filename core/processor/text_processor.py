@@ -1,27 +1,267 @@
 """
 Text file processor with advanced NLP capabilities.
 """
+import io
+import os
 import streamlit as st
 import pandas as pd
-from typing import Tuple, Dict
+from collections import Counter
+from functools import lru_cache
+from itertools import chain
+from typing import Tuple, Dict, List
 import re
+from joblib import Parallel, delayed
 
+from config.config import NLP_CONFIG
 from core.processor.base_processor import BaseProcessor
 from core.nlp.entity_extractor import EntityExtractor
 from core.nlp.relationship_extractor import RelationshipExtractor
+from core.nlp.pipeline import NLPPipeline
+from core.nlp.entity_mentions import build_entity_finder, find_entity_mentions, iter_mention_pairs
 from utils.text_utils import clean_text, tokenize_sentences
 from utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
 
+# Characters of text cleaned and sentence-split at a time
+PARAGRAPH_BLOCK_CHARS = 64 * 1024
+
+# Relationship templates as (text between source and target,
+# text right after target or None, relationship type)
+_RELATIONSHIP_TEMPLATES = [
+    # Ownership & Founding
+    (r'\s+owns?\s+', None, 'OWNS'),
+    (r'\s+(?:founded|established|created|started)\s+', None, 'FOUNDED'),
+    
+    # Employment & Work
+    (r'\s+works?\s+(?:at|for|with)\s+', None, 'WORKS_AT'),
+    (r'\s+(?:is|was)\s+(?:a|an|the)?\s*(?:employee|engineer|developer|analyst|consultant|specialist)\s+(?:at|of|for)\s+', None, 'WORKS_AT'),
+    
+    # Management & Leadership
+    (r'\s+(?:manages?|leads?|heads?|runs?|oversees?|supervises?|directs?)\s+(?:the\s+)?', None, 'MANAGES'),
+    (r'\s+(?:is|was)\s+(?:a|an|the)?\s*(?:manager|director|head|leader|supervisor|chief)\s+(?:of|at)\s+', None, 'MANAGES'),
+    
+    # Reporting Structure
+    (r'\s+reports?\s+to\s+', None, 'REPORTS_TO'),
+    (r'\s+works?\s+under\s+', None, 'REPORTS_TO'),
+    
+    # Collaboration
+    (r'\s+(?:collaborates?|works?|partners?|cooperates?)\s+with\s+', None, 'COLLABORATES_WITH'),
+    (r'\s+(?:and\s+)?', r'\s+(?:collaborate|work together|partner)', 'COLLABORATES_WITH'),
+    
+    # Team Coordination
+    (r'\s+(?:coordinates?|cooperates?)\s+with\s+(?:the\s+)?', None, 'COORDINATES_WITH'),
+    (r'\s+(?:often\s+)?coordinates?\s+with\s+(?:the\s+)?', None, 'COORDINATES_WITH'),
+    
+    # Products & Services
+    (r'\s+(?:produces?|manufactures?|makes?|develops?|creates?)\s+', None, 'PRODUCES'),
+    (r'\s+(?:has|offers?|provides?)\s+', None, 'OFFERS'),
+    (r'\s+(?:sells?|markets?)\s+', None, 'SELLS'),
+    
+    # Location
+    (r'\s+(?:is\s+)?(?:located|based|headquartered|situated)\s+(?:in|at)\s+', None, 'LOCATED_IN'),
+    (r'\s+(?:has\s+)?(?:offices?|branches?|facilities?|locations?)\s+(?:in|at)\s+', None, 'HAS_OFFICE_IN'),
+    
+    # Hiring & Employment
+    (r'\s+(?:hired|employed|recruited|brought on)\s+', None, 'HIRED'),
+    (r'\s+recently\s+hired\s+', None, 'HIRED'),
+    
+    # Internships & Training
+    (r'\s+(?:previously\s+)?(?:interned?|worked)\s+(?:at|for|under|with)\s+', None, 'INTERNED_AT'),
+    (r'\s+(?:interned?|worked)\s+under\s+', None, 'INTERNED_UNDER'),
+    
+    # Professional Relationships
+    (r'\s+(?:previously\s+)?worked\s+(?:with|alongside)\s+', None, 'WORKED_WITH'),
+    (r'\s+(?:and\s+)?', r'\s+worked\s+(?:together\s+)?on\s+(?:a\s+)?(?:joint\s+)?project', 'WORKED_WITH'),
+    
+    # Events & Activities
+    (r'\s+(?:and\s+)?', r'\s+attended\s+(?:the\s+)?same\s+(?:workshop|conference|event|meeting)', 'ATTENDED_WITH'),
+    (r'\s+attended\s+', None, 'ATTENDED'),
+    
+    # Membership
+    (r'\s+(?:is|was)\s+(?:a\s+)?(?:member|part)\s+of\s+', None, 'MEMBER_OF'),
+    (r'\s+(?:joins?|joined)\s+', None, 'JOINED'),
+]
+
+# Between-only templates as one alternation; the matched group's name
+# (e.g. WORKS_AT_3) carries the relationship type. Templates are lowercase
+# and run case-sensitively on lowercased sentences.
+_BETWEEN_PATTERN = re.compile(
+    "|".join(
+        f"(?P<{rel_type}_{i}>{between})"
+        for i, (between, after, rel_type) in enumerate(_RELATIONSHIP_TEMPLATES)
+        if after is None
+    )
+)
+
+# The same templates one by one as (template index, pattern, relationship type)
+_BETWEEN_PATTERNS = [
+    (i, re.compile(between), rel_type)
+    for i, (between, after, rel_type) in enumerate(_RELATIONSHIP_TEMPLATES)
+    if after is None
+]
+
+# Templates that also need the text following the target ("A and B collaborate")
+_FOLLOWING_PATTERNS = [
+    (re.compile(between), re.compile(after), rel_type)
+    for between, after, rel_type in _RELATIONSHIP_TEMPLATES
+    if after is not None
+]
+
+
+def _iter_paragraph_blocks(reader: io.TextIOBase, min_chars: int = PARAGRAPH_BLOCK_CHARS):
+    """Yield the text in blocks of at least min_chars, split only at blank lines."""
+    block = []
+    size = 0
+    for line in reader:
+        block.append(line)
+        size += len(line)
+        if size >= min_chars and line.isspace():
+            yield "".join(block)
+            block = []
+            size = 0
+    if block:
+        yield "".join(block)
+
+
+def _extract_entity_patterns(
+    sentence: str,
+    entities: Dict[str, str],
+    entity_finder: re.Pattern,
+    canonical_names: Dict[str, str],
+    seen: set = None
+) -> list:
+    """
+    Extract patterns using actual entity names.
+    
+    Args:
+        seen: (source, relationship, target) keys already emitted; shared
+            across calls so repeated matches never become rows
+    """
+    relationships = []
+    if seen is None:
+        seen = set()
+    
+    # Lowercase once; every pattern below is case-sensitive
+    lower_sentence = sentence.lower()
+    
+    # Locate entity mentions (whole words, overlapping ones included)
+    mentions = find_entity_mentions(lower_sentence, entity_finder, canonical_names)
+    if len(mentions) < 2:
+        return relationships
+    
+    # A relationship phrase must span exactly the text between two mentions
+    for (_, source_end, source_entity), (target_start, target_end, target_entity) in iter_mention_pairs(mentions):
+        rel_types = []
+        
+        match = _BETWEEN_PATTERN.fullmatch(lower_sentence, source_end, target_start)
+        if match:
+            # The alternation stops at the first template that matches; later
+            # ones can match the same text ("worked under": INTERNED_AT and
+            # INTERNED_UNDER)
+            first = int(match.lastgroup.rsplit("_", 1)[1])
+            rel_types.extend(
+                rel_type for i, between, rel_type in _BETWEEN_PATTERNS
+                if i == first or (i > first and between.fullmatch(lower_sentence, source_end, target_start))
+            )
+        
+        for between, after, rel_type in _FOLLOWING_PATTERNS:
+            if between.fullmatch(lower_sentence, source_end, target_start) and after.match(lower_sentence, target_end):
+                rel_types.append(rel_type)
+        
+        for rel_type in rel_types:
+            key = (source_entity, rel_type, target_entity)
+            if key in seen:
+                continue
+            seen.add(key)
+            
+            relationships.append({
+                "source": source_entity,
+                "relationship": rel_type,
+                "target": target_entity,
+                "sentence": sentence,
+                "source_type": entities.get(source_entity, "Entity"),
+                "target_type": entities.get(target_entity, "Entity"),
+                "confidence": "high"  # Pattern-based extraction is high confidence
+            })
+    
+    return relationships
+
+
+def _extract_patterns_chunk(
+    sentences: List[str],
+    entities: Dict[str, str],
+    entity_finder: re.Pattern,
+    canonical_names: Dict[str, str]
+) -> list:
+    """Extract entity patterns from a chunk of sentences (joblib worker entry point)."""
+    relationships = []
+    seen = set()
+    for sentence in sentences:
+        relationships.extend(
+            _extract_entity_patterns(sentence, entities, entity_finder, canonical_names, seen)
+        )
+    return relationships
+
+
+def _extract_patterns(sentences: List[str], entities: Dict[str, str]) -> list:
+    """Run entity pattern matching over all sentences, in parallel for large inputs."""
+    if not entities:
+        return []
+    
+    entity_finder, canonical_names = build_entity_finder(entities)
+    args = (entities, entity_finder, canonical_names)
+    
+    # Worker startup and pickling only pay off on larger inputs
+    text_size = sum(len(sentence) for sentence in sentences)
+    if not NLP_CONFIG["pattern_parallelism"] or text_size < NLP_CONFIG["pattern_parallel_min_bytes"]:
+        return _extract_patterns_chunk(sentences, *args)
+    
+    cpu_count = os.cpu_count() or 1
+    n_chunks = max(len(sentences) // 1000, cpu_count)
+    chunk_size = -(-len(sentences) // n_chunks)
+    chunks = [sentences[i:i + chunk_size] for i in range(0, len(sentences), chunk_size)]
+    
+    # Nothing to run side by side - skip worker startup and pickling
+    if len(chunks) <= 1 or cpu_count == 1:
+        return _extract_patterns_chunk(sentences, *args)
+    
+    results = Parallel(n_jobs=-1, prefer="processes")(
+        delayed(_extract_patterns_chunk)(chunk, *args) for chunk in chunks
+    )
+    
+    # Chunks deduplicate locally; drop matches repeated across chunks
+    relationships = []
+    seen = set()
+    for rel in chain.from_iterable(results):
+        key = (rel["source"], rel["relationship"], rel["target"])
+        if key not in seen:
+            seen.add(key)
+            relationships.append(rel)
+    return relationships
+
+
+@lru_cache(maxsize=1)
+def _get_entity_extractor() -> EntityExtractor:
+    """Process-wide EntityExtractor, so its loaded model is reused across uploads."""
+    return EntityExtractor()
+
+
+@lru_cache(maxsize=1)
+def _get_relationship_extractor() -> RelationshipExtractor:
+    """Process-wide RelationshipExtractor, so its loaded model is reused across uploads."""
+    return RelationshipExtractor()
+
+
 class TextProcessor(BaseProcessor):
     """Processor for text files with advanced relationship extraction."""
     
     def __init__(self, uploaded_file):
         super().__init__(uploaded_file)
-        self.entity_extractor = EntityExtractor()
-        self.relationship_extractor = RelationshipExtractor()
+        self.entity_extractor = _get_entity_extractor()
+        self.relationship_extractor = _get_relationship_extractor()
+        self.nlp_pipeline = NLPPipeline(self.entity_extractor, self.relationship_extractor)
     
     def process(self) -> Tuple[pd.DataFrame, Dict]:
         """Process text file and extract entities/relationships."""
@@ -29,55 +269,36 @@ class TextProcessor(BaseProcessor):
         status_text = st.empty()
         
         try:
-            # Read file
+            # Read, clean and tokenize sentences
             status_text.text("📄 Reading text file...")
-            text = self.file.read().decode("utf-8")
-            progress_bar.progress(15)
-            
-            # Clean text
-            status_text.text("🧹 Cleaning text...")
-            text = clean_text(text)
-            progress_bar.progress(25)
-            
-            # Tokenize sentences
-            status_text.text("✂️ Tokenizing sentences...")
-            sentences = tokenize_sentences(text)
+            sentences = self._read_sentences()
             progress_bar.progress(35)
             
-            # Extract entities first
+            # Entities and dependency relationships from a single spaCy pass
             status_text.text("🔍 Extracting entities...")
-            entities = self.entity_extractor.extract_from_sentences(sentences)
+            entities, dep_rels = self.nlp_pipeline.run(sentences)
             progress_bar.progress(50)
             
-            logger.info(f"Found {len(entities)} unique entities")
-            
             # Extract relationships using multiple methods
             status_text.text("🔗 Extracting relationships...")
-            relationships = []
             
             # Method 1: Entity-aware pattern matching (most accurate)
-            for sent in sentences:
-                pattern_rels = self._extract_entity_patterns(sent, entities)
-                relationships.extend(pattern_rels)
-            
-            progress_bar.progress(65)
-            
-            # Method 2: Advanced dependency parsing
-            dep_rels = self.relationship_extractor.extract_from_sentences(
-                sentences, entities
-            )
-            relationships.extend(dep_rels)
+            relationships = _extract_patterns(sentences, entities)
             
             progress_bar.progress(80)
             
-            # Build DataFrame
-            df = pd.DataFrame(relationships)
+            # Build DataFrame; pattern matches win over the same dependency triple
+            df = dep_rels
+            if relationships:
+                seen = {(rel["source"], rel["relationship"], rel["target"]) for rel in relationships}
+                if not dep_rels.empty:
+                    keys = pd.MultiIndex.from_frame(dep_rels[["source", "relationship", "target"]].astype(object))
+                    dep_rels = dep_rels[~keys.isin(seen)]
+                df = pd.concat([pd.DataFrame(relationships), dep_rels], ignore_index=True)
             
             # Clean and deduplicate
             if not df.empty:
-                df = self._clean_relationships(df)
-                df = self._prioritize_relationships(df)
-                df = self._enhance_entity_types(df, entities)
+                df = self._postprocess(df)
             
             progress_bar.progress(95)
             
@@ -103,183 +324,101 @@ class TextProcessor(BaseProcessor):
             status_text.empty()
             raise
     
-    def _extract_entity_patterns(self, sentence: str, entities: Dict[str, str]) -> list:
-        """Extract patterns using actual entity names."""
-        relationships = []
-        
-        # Sort entities by length (longest first) to avoid partial matches
-        entity_names = sorted(entities.keys(), key=len, reverse=True)
-        
-        for source_entity in entity_names:
-            for target_entity in entity_names:
-                if source_entity == target_entity:
-                    continue
-                
-                # Escape special regex characters
-                source_escaped = re.escape(source_entity)
-                target_escaped = re.escape(target_entity)
-                
-                # Comprehensive relationship patterns
-                patterns = [
-                    # Ownership & Founding
-                    (rf'{source_escaped}\s+owns?\s+{target_escaped}', 'OWNS'),
-                    (rf'{source_escaped}\s+(?:founded|established|created|started)\s+{target_escaped}', 'FOUNDED'),
-                    
-                    # Employment & Work
-                    (rf'{source_escaped}\s+works?\s+(?:at|for|with)\s+{target_escaped}', 'WORKS_AT'),
-                    (rf'{source_escaped}\s+(?:is|was)\s+(?:a|an|the)?\s*(?:employee|engineer|developer|analyst|consultant|specialist)\s+(?:at|of|for)\s+{target_escaped}', 'WORKS_AT'),
-                    
-                    # Management & Leadership
-                    (rf'{source_escaped}\s+(?:manages?|leads?|heads?|runs?|oversees?|supervises?|directs?)\s+(?:the\s+)?{target_escaped}', 'MANAGES'),
-                    (rf'{source_escaped}\s+(?:is|was)\s+(?:a|an|the)?\s*(?:manager|director|head|leader|supervisor|chief)\s+(?:of|at)\s+{target_escaped}', 'MANAGES'),
-                    
-                    # Reporting Structure
-                    (rf'{source_escaped}\s+reports?\s+to\s+{target_escaped}', 'REPORTS_TO'),
-                    (rf'{source_escaped}\s+works?\s+under\s+{target_escaped}', 'REPORTS_TO'),
-                    
-                    # Collaboration
-                    (rf'{source_escaped}\s+(?:collaborates?|works?|partners?|cooperates?)\s+with\s+{target_escaped}', 'COLLABORATES_WITH'),
-                    (rf'{source_escaped}\s+(?:and\s+)?{target_escaped}\s+(?:collaborate|work together|partner)', 'COLLABORATES_WITH'),
-                    
-                    # Team Coordination
-                    (rf'{source_escaped}\s+(?:coordinates?|cooperates?)\s+with\s+(?:the\s+)?{target_escaped}', 'COORDINATES_WITH'),
-                    (rf'(?:the\s+)?{source_escaped}\s+(?:often\s+)?coordinates?\s+with\s+(?:the\s+)?{target_escaped}', 'COORDINATES_WITH'),
-                    
-                    # Products & Services
-                    (rf'{source_escaped}\s+(?:produces?|manufactures?|makes?|develops?|creates?)\s+{target_escaped}', 'PRODUCES'),
-                    (rf'{source_escaped}\s+(?:has|offers?|provides?)\s+{target_escaped}', 'OFFERS'),
-                    (rf'{source_escaped}\s+(?:sells?|markets?)\s+{target_escaped}', 'SELLS'),
-                    
-                    # Location
-                    (rf'{source_escaped}\s+(?:is\s+)?(?:located|based|headquartered|situated)\s+(?:in|at)\s+{target_escaped}', 'LOCATED_IN'),
-                    (rf'{source_escaped}\s+(?:has\s+)?(?:offices?|branches?|facilities?|locations?)\s+(?:in|at)\s+{target_escaped}', 'HAS_OFFICE_IN'),
-                    
-                    # Hiring & Employment
-                    (rf'{source_escaped}\s+(?:hired|employed|recruited|brought on)\s+{target_escaped}', 'HIRED'),
-                    (rf'{source_escaped}\s+recently\s+hired\s+{target_escaped}', 'HIRED'),
-                    
-                    # Internships & Training
-                    (rf'{source_escaped}\s+(?:previously\s+)?(?:interned?|worked)\s+(?:at|for|under|with)\s+{target_escaped}', 'INTERNED_AT'),
-                    (rf'{source_escaped}\s+(?:interned?|worked)\s+under\s+{target_escaped}', 'INTERNED_UNDER'),
-                    
-                    # Professional Relationships
-                    (rf'{source_escaped}\s+(?:previously\s+)?worked\s+(?:with|alongside)\s+{target_escaped}', 'WORKED_WITH'),
-                    (rf'{source_escaped}\s+(?:and\s+)?{target_escaped}\s+worked\s+(?:together\s+)?on\s+(?:a\s+)?(?:joint\s+)?project', 'WORKED_WITH'),
-                    
-                    # Events & Activities
-                    (rf'{source_escaped}\s+(?:and\s+)?{target_escaped}\s+attended\s+(?:the\s+)?same\s+(?:workshop|conference|event|meeting)', 'ATTENDED_WITH'),
-                    (rf'{source_escaped}\s+attended\s+{target_escaped}', 'ATTENDED'),
-                    
-                    # Membership
-                    (rf'{source_escaped}\s+(?:is|was)\s+(?:a\s+)?(?:member|part)\s+of\s+{target_escaped}', 'MEMBER_OF'),
-                    (rf'{source_escaped}\s+(?:joins?|joined)\s+{target_escaped}', 'JOINED'),
-                ]
-                
-                for pattern, rel_type in patterns:
-                    if re.search(pattern, sentence, re.IGNORECASE):
-                        relationships.append({
-                            "source": source_entity,
-                            "relationship": rel_type,
-                            "target": target_entity,
-                            "sentence": sentence,
-                            "source_type": entities.get(source_entity, "Entity"),
-                            "target_type": entities.get(target_entity, "Entity"),
-                            "confidence": "high"  # Pattern-based extraction is high confidence
-                        })
-        
-        return relationships
+    def _read_sentences(self) -> List[str]:
+        """Decode, clean and tokenize the file one block of paragraphs at a time."""
+        reader = io.TextIOWrapper(self.file, encoding="utf-8")
+        try:
+            sentences = []
+            for block in _iter_paragraph_blocks(reader):
+                text = clean_text(block)
+                if text:
+                    sentences.extend(tokenize_sentences(text))
+            return sentences
+        finally:
+            # Detach so closing the wrapper doesn't close the uploaded file
+            reader.detach()
     
-    def _clean_relationships(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Clean and validate relationships."""
-        if df.empty:
-            return df
-        
-        # Remove null relationships
-        df = df[df['relationship'].notna() & (df['relationship'] != '')]
-        
-        # Remove self-referencing relationships
-        df = df[df['source'].str.lower() != df['target'].str.lower()]
-        
-        # Remove duplicates
-        df = df.drop_duplicates(subset=['source', 'relationship', 'target'])
-        
-        # Normalize relationship names
-        df['relationship'] = df['relationship'].str.upper().str.replace(' ', '_')
-        
-        return df
+    # Relationship hierarchy (generic to specific)
+    GENERIC_RELATIONSHIPS = {
+        'CO_OCCURS': 1,
+        'RELATED_TO': 2,
+        'ASSOCIATED_WITH': 3,
+        'CONNECTED_TO': 4,
+        'HAS': 5,
+        'OFFERS': 6,
+    }
+    
+    # Map entity types to more readable names
+    ENTITY_TYPE_NAMES = {
+        'PERSON': 'Person',
+        'ORG': 'Organization',
+        'GPE': 'Location',
+        'LOC': 'Location',
+        'DATE': 'Date',
+        'TIME': 'Time',
+        'MONEY': 'Money',
+        'PRODUCT': 'Product',
+        'EVENT': 'Event',
+        'WORK_OF_ART': 'WorkOfArt',
+        'FAC': 'Facility',
+        'NORP': 'Group',
+    }
     
-    def _prioritize_relationships(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Remove generic relationships if more specific ones exist."""
+    def _postprocess(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Clean, prioritize and type relationships in one pass.
+        
+        Drops null and self-referencing relationships, keeps the most
+        specific relationship per source-target pair and gives entity
+        types readable names.
+        """
+        # Remove null and self-referencing relationships with one mask
+        valid = (
+            df['relationship'].notna()
+            & (df['relationship'] != '')
+            & (df['source'].str.lower() != df['target'].str.lower())
+        )
+        df = df[valid]
         if df.empty:
             return df
         
-        # Define relationship hierarchy (generic to specific)
-        generic_rels = {
-            'CO_OCCURS': 1,
-            'RELATED_TO': 2,
-            'ASSOCIATED_WITH': 3,
-            'CONNECTED_TO': 4,
-            'HAS': 5,
-            'OFFERS': 6,
-        }
-        
-        # Group by source-target pairs
-        result_rows = []
-        for (source, target), group in df.groupby(['source', 'target']):
-            # Sort by specificity (non-generic first)
-            group['priority'] = group['relationship'].map(
-                lambda x: generic_rels.get(x, 100)  # High priority for specific rels
-            )
-            
-            # Take the most specific relationship
-            best_rel = group.nlargest(1, 'priority')
-            
-            # Only keep if not too generic
-            if best_rel.iloc[0]['priority'] > 1:
-                result_rows.append(best_rel.iloc[0])
+        # Normalize relationship names (once per distinct name)
+        relationship = self._map_categories(
+            df['relationship'], lambda rel: rel.upper().replace(' ', '_')
+        )
         
-        if result_rows:
-            result_df = pd.DataFrame(result_rows).drop('priority', axis=1)
-            return result_df.reset_index(drop=True)
+        # Specific relationships rank above all generic ones
+        df = df.assign(
+            relationship=relationship,
+            priority=relationship.map(self.GENERIC_RELATIONSHIPS).fillna(100).astype('int32')
+        )
         
-        return df
-    
-    def _enhance_entity_types(self, df: pd.DataFrame, entities: Dict[str, str]) -> pd.DataFrame:
-        """Ensure all entities have proper types."""
-        if df.empty:
-            return df
+        # Take the most specific relationship per source-target pair,
+        # unless every pair only has the most generic one
+        best = df.loc[df.groupby(['source', 'target'], sort=False, observed=True)['priority'].idxmax()]
+        best = best[best['priority'] > 1]
+        if not best.empty:
+            df = best.reset_index(drop=True)
+        df = df.drop(columns='priority')
         
-        # Map entity types to more readable names
-        type_mapping = {
-            'PERSON': 'Person',
-            'ORG': 'Organization',
-            'GPE': 'Location',
-            'LOC': 'Location',
-            'DATE': 'Date',
-            'TIME': 'Time',
-            'MONEY': 'Money',
-            'PRODUCT': 'Product',
-            'EVENT': 'Event',
-            'WORK_OF_ART': 'WorkOfArt',
-            'FAC': 'Facility',
-            'NORP': 'Group',
-        }
+        def readable_type(entity_type):
+            return self.ENTITY_TYPE_NAMES.get(entity_type, entity_type if entity_type else 'Entity')
         
-        df['source_type'] = df['source_type'].map(
-            lambda x: type_mapping.get(x, x if x else 'Entity')
-        )
-        df['target_type'] = df['target_type'].map(
-            lambda x: type_mapping.get(x, x if x else 'Entity')
-        )
+        df['source_type'] = self._map_categories(df['source_type'], readable_type)
+        df['target_type'] = self._map_categories(df['target_type'], readable_type)
         
         return df
     
+    @staticmethod
+    def _map_categories(series: pd.Series, func) -> pd.Series:
+        """Apply func to each distinct value of a column rather than to every row."""
+        values = series.astype('category')
+        categories = values.cat.categories
+        return values.map(dict(zip(categories, map(func, categories))))
+    
     def _count_entity_types(self, entities: Dict[str, str]) -> Dict[str, int]:
         """Count entities by type."""
-        type_counts = {}
-        for entity_type in entities.values():
-            type_counts[entity_type] = type_counts.get(entity_type, 0) + 1
-        return type_counts
+        return dict(Counter(entities.values()))
     
     def get_graph_name(self) -> str:
         """Get intelligent graph name from content."""
@@ -1,16 +1,36 @@
 """
 Enhanced graph builder with beautiful visualization support.
 """
+import re
 from neo4j import Driver, Session
+from neo4j.exceptions import ClientError
 import pandas as pd
+from pyvis.edge import Edge
 from pyvis.network import Network
 from typing import Dict
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Unquoted Cypher identifier: letter or underscore, then word characters
+IDENTIFIER_PATTERN = re.compile(r'[^\W\d]\w*')
 
 class GraphBuilder:
     """Build and visualize knowledge graphs in Neo4j."""
     
+    # Columns that mark a DataFrame as text relationships
+    TEXT_COLUMNS = frozenset({'source', 'target', 'relationship'})
+    
+    # Rows per UNWIND write transaction
+    BATCH_SIZE = 10_000
+    
+    # Structured writes at least this large run server-side via APOC
+    APOC_MIN_ROWS = 50_000
+    APOC_BATCH_SIZE = 5_000
+    
     def __init__(self, driver: Driver):
         self.driver = driver
+        self._apoc_available = None
         
         # Color scheme for different node types
         self.node_colors = {
@@ -55,159 +75,186 @@ class GraphBuilder:
     
     def _is_text_data(self, df: pd.DataFrame) -> bool:
         """Check if DataFrame is from text processing."""
-        required_cols = {'source', 'target', 'relationship'}
-        return required_cols.issubset(set(df.columns))
+        return self.TEXT_COLUMNS.issubset(df.columns)
     
     def _create_text_graph(self, session: Session, df: pd.DataFrame):
         """Create beautiful graph from text entity relationships."""
-        created_nodes = set()
+        df = df[df['source'].notna() & df['target'].notna()].astype(object)
+        if df.empty:
+            return
         
-        for idx, row in df.iterrows():
-            source = row.get('source')
-            target = row.get('target')
-            rel_type = row.get('relationship', 'RELATED_TO')
-            
-            if pd.isna(source) or pd.isna(target):
-                continue
-            
-            # Clean relationship type
-            rel_type = self._clean_relationship_type(rel_type)
-            
-            # Get entity types
-            source_type = self._clean_node_label(row.get('source_type', 'Entity'))
-            target_type = self._clean_node_label(row.get('target_type', 'Entity'))
-            
-            # Create nodes if they don't exist
-            if source not in created_nodes:
-                self._create_node(session, source, source_type)
-                created_nodes.add(source)
-            
-            if target not in created_nodes:
-                self._create_node(session, target, target_type)
-                created_nodes.add(target)
-            
-            # Create relationship
-            self._create_relationship(
-                session,
-                source, target,
-                rel_type,
-                row.get('sentence', ''),
-                row.get('confidence', 'medium')
-            )
-    
-    def _create_node(self, session: Session, name: str, node_type: str):
-        """Create a node with proper label and properties."""
-        query = f"""
-            MERGE (n:{node_type} {{name: $name}})
-            SET n.type = $node_type,
-                n.created = timestamp()
-        """
+        # Each entity keeps the label of its first appearance
+        node_labels = {}
+        for source, target, source_type, target_type in zip(
+            df['source'].astype(str),
+            df['target'].astype(str),
+            self._column_or_default(df, 'source_type', 'Entity'),
+            self._column_or_default(df, 'target_type', 'Entity')
+        ):
+            node_labels.setdefault(source, self._clean_node_label(source_type))
+            node_labels.setdefault(target, self._clean_node_label(target_type))
         
-        try:
-            session.run(query, name=str(name), node_type=node_type)
-        except Exception as e:
-            # Fallback to Entity if label is invalid
-            query_fallback = """
-                MERGE (n:Entity {name: $name})
+        # Create nodes - one UNWIND per label
+        nodes = pd.DataFrame({'name': list(node_labels), 'node_type': list(node_labels.values())})
+        for node_type, group in nodes.groupby('node_type', sort=False):
+            label = node_type if self._is_valid_identifier(node_type) else 'Entity'
+            query = f"""
+                UNWIND $rows AS name
+                MERGE (n:{label} {{name: name}})
                 SET n.type = $node_type,
                     n.created = timestamp()
             """
-            session.run(query_fallback, name=str(name), node_type=node_type)
-    
-    def _create_relationship(
-        self,
-        session: Session,
-        source: str,
-        target: str,
-        rel_type: str,
-        sentence: str = '',
-        confidence: str = 'medium'
-    ):
-        """Create a relationship between two nodes."""
-        query = f"""
-            MATCH (a {{name: $source}})
-            MATCH (b {{name: $target}})
-            MERGE (a)-[r:{rel_type}]->(b)
-            SET r.sentence = $sentence,
-                r.confidence = $confidence,
-                r.created = timestamp()
-        """
+            self._write_batches(session, query, group['name'].tolist(), node_type=node_type)
         
-        try:
-            session.run(
-                query,
-                source=str(source),
-                target=str(target),
-                sentence=str(sentence),
-                confidence=confidence
-            )
-        except Exception as e:
-            # Fallback to generic RELATED_TO
-            query_fallback = """
-                MATCH (a {name: $source})
-                MATCH (b {name: $target})
-                MERGE (a)-[r:RELATED_TO]->(b)
-                SET r.sentence = $sentence,
-                    r.original_type = $rel_type,
-                    r.confidence = $confidence
-            """
-            session.run(
-                query_fallback,
-                source=str(source),
-                target=str(target),
-                sentence=str(sentence),
-                rel_type=rel_type,
-                confidence=confidence
+        # Create relationships - one UNWIND per (type, source label, target label)
+        created_labels = {
+            name: node_type if self._is_valid_identifier(node_type) else 'Entity'
+            for name, node_type in node_labels.items()
+        }
+        rels = pd.DataFrame({
+            'source': df['source'].astype(str),
+            'target': df['target'].astype(str),
+            'rel_type': self._column_or_default(df, 'relationship', 'RELATED_TO').map(self._clean_relationship_type),
+            'sentence': self._column_or_default(df, 'sentence', '').fillna('').astype(str),
+            'confidence': self._column_or_default(df, 'confidence', 'medium').fillna('medium')
+        })
+        rels['source_label'] = rels['source'].map(created_labels)
+        rels['target_label'] = rels['target'].map(created_labels)
+        
+        for (rel_type, source_label, target_label), group in rels.groupby(
+            ['rel_type', 'source_label', 'target_label'], sort=False, observed=True
+        ):
+            rows = group[['source', 'target', 'sentence', 'confidence', 'rel_type']].to_dict('records')
+            
+            if self._is_valid_identifier(rel_type):
+                query = f"""
+                    UNWIND $rows AS row
+                    MATCH (a:{source_label} {{name: row.source}})
+                    MATCH (b:{target_label} {{name: row.target}})
+                    MERGE (a)-[r:{rel_type}]->(b)
+                    SET r.sentence = row.sentence,
+                        r.confidence = row.confidence,
+                        r.created = timestamp()
+                """
+            else:
+                # Fallback to generic RELATED_TO
+                query = f"""
+                    UNWIND $rows AS row
+                    MATCH (a:{source_label} {{name: row.source}})
+                    MATCH (b:{target_label} {{name: row.target}})
+                    MERGE (a)-[r:RELATED_TO]->(b)
+                    SET r.sentence = row.sentence,
+                        r.original_type = row.rel_type,
+                        r.confidence = row.confidence
+                """
+            self._write_batches(session, query, rows)
+    
+    def _write_batches(self, session: Session, query: str, rows: list, **params):
+        """Run an UNWIND query in write transactions of at most BATCH_SIZE rows."""
+        for start in range(0, len(rows), self.BATCH_SIZE):
+            batch = rows[start:start + self.BATCH_SIZE]
+            session.execute_write(
+                lambda tx: tx.run(query, rows=batch, **params).consume()
             )
     
+    @staticmethod
+    def _column_or_default(df: pd.DataFrame, col: str, value) -> pd.Series:
+        """Get a column, or a constant Series if the DataFrame lacks it."""
+        if col in df.columns:
+            return df[col]
+        return pd.Series(value, index=df.index)
+    
     def _create_structured_graph(self, session: Session, app_name: str, df: pd.DataFrame):
         """Create graph for structured CSV/JSON data."""
         # Create root app node
-        session.run("MERGE (a:App {name: $app_name})", app_name=app_name)
+        session.execute_write(
+            lambda tx: tx.run("MERGE (a:App {name: $app_name})", app_name=app_name).consume()
+        )
         
-        # Process each row
-        for idx, row in df.iterrows():
-            row_dict = row.to_dict()
-            
-            for key, value in row_dict.items():
-                if value is None or pd.isna(value):
-                    continue
-                
+        # Collect entity rows per relationship type - one UNWIND per type
+        rows_by_type = {}
+        for key, column in df.items():
+            rows = rows_by_type.setdefault(f"HAS_{self._clean_relationship_type(key)}", [])
+            for value in column:
                 if isinstance(value, list):
-                    for v in value:
-                        self._create_app_relation(session, app_name, key, v)
-                else:
-                    self._create_app_relation(session, app_name, key, value)
+                    rows.extend({"value": str(v), "key": key} for v in value)
+                elif value is not None and not pd.isna(value):
+                    rows.append({"value": str(value), "key": key})
+        
+        for rel_type, rows in rows_by_type.items():
+            if not rows:
+                continue
+            
+            # Statement applied to each `row` against the app node `a`
+            if self._is_valid_identifier(rel_type):
+                statement = f"""
+                    MERGE (b:DataEntity {{name: row.value, property: row.key}})
+                    MERGE (a)-[r:{rel_type}]->(b)
+                """
+            else:
+                # Fallback with generic relationship
+                statement = """
+                    MERGE (b:DataEntity {name: row.value, property: row.key})
+                    MERGE (a)-[r:HAS_PROPERTY]->(b)
+                    SET r.property_name = row.key
+                """
+            
+            if len(rows) >= self.APOC_MIN_ROWS and self._write_with_apoc(session, statement, rows, app_name):
+                continue
+            
+            query = "MATCH (a:App {name: $app_name}) UNWIND $rows AS row " + statement
+            self._write_batches(session, query, rows, app_name=app_name)
     
-    def _create_app_relation(self, session: Session, app_name: str, key: str, value):
-        """Create relationship from app node to data entity."""
-        rel_type = f"HAS_{self._clean_relationship_type(key)}"
+    def _write_with_apoc(self, session: Session, statement: str, rows: list, app_name: str) -> bool:
+        """
+        Write rows server-side with apoc.periodic.iterate.
         
-        query = f"""
-            MATCH (a:App {{name: $app_name}})
-            MERGE (b:DataEntity {{name: $value, property: $key}})
-            MERGE (a)-[r:{rel_type}]->(b)
+        Returns:
+            False if APOC is not installed or a batch failed, so the caller
+            falls back to client-side batches (the statements only MERGE)
         """
+        if not self._has_apoc(session):
+            return False
         
-        try:
-            session.run(query, app_name=app_name, value=str(value), key=key)
-        except Exception as e:
-            # Fallback with generic relationship
-            query_fallback = """
-                MATCH (a:App {name: $app_name})
-                MERGE (b:DataEntity {name: $value, property: $key})
-                MERGE (a)-[r:HAS_PROPERTY]->(b)
-                SET r.property_name = $key
+        result = session.run(
             """
-            session.run(query_fallback, app_name=app_name, value=str(value), key=key)
+            CALL apoc.periodic.iterate(
+                'UNWIND $rows AS row RETURN row',
+                $statement,
+                {batchSize: $batch_size, parallel: false, params: {rows: $rows, app_name: $app_name}}
+            )
+            YIELD failedBatches, errorMessages
+            RETURN failedBatches, errorMessages
+            """,
+            statement="MATCH (a:App {name: $app_name}) " + statement,
+            rows=rows,
+            batch_size=self.APOC_BATCH_SIZE,
+            app_name=app_name
+        ).single()
+        
+        if result["failedBatches"]:
+            logger.warning(f"apoc.periodic.iterate failed {result['failedBatches']} batches: {result['errorMessages']}")
+            return False
+        return True
+    
+    def _has_apoc(self, session: Session) -> bool:
+        """Check once whether the APOC plugin is available."""
+        if self._apoc_available is None:
+            try:
+                session.run("RETURN apoc.version() AS version").consume()
+                self._apoc_available = True
+            except ClientError:
+                logger.info("APOC not available, using client-side batches")
+                self._apoc_available = False
+        return self._apoc_available
     
     def add_to_pyvis(self, net: Network):
         """Load nodes/edges from Neo4j and create beautiful visualization."""
         with self.driver.session() as session:
-            # Fetch nodes with their types
+            # Fetch nodes with their types (add_node skips repeated names)
             node_result = session.run("""
                 MATCH (n)
-                RETURN DISTINCT n.name AS name, 
+                RETURN n.name AS name, 
                        labels(n)[0] AS type,
                        n.type AS stored_type
             """)
@@ -236,30 +283,60 @@ class GraphBuilder:
                        r.confidence AS confidence
             """)
             
-            # Add edges with labels and colors
-            for record in edge_result:
-                from_node = record["from"]
-                to_node = record["to"]
-                rel_type = record["rel"]
-                confidence = record.get("confidence", "medium")
-                
-                # Get relationship color
-                color = self.relationship_colors.get(rel_type, '#7F8C8D')
-                
-                # Edge width based on confidence
-                width_map = {'high': 3, 'medium': 2, 'low': 1}
-                width = width_map.get(confidence, 2)
-                
-                net.add_edge(
-                    from_node,
-                    to_node,
-                    title=rel_type,
-                    label=rel_type,
-                    color=color,
-                    width=width,
-                    arrows='to',
-                    font={'size': 10, 'align': 'middle'}
-                )
+            edges = pd.DataFrame(edge_result.data(), columns=['from', 'to', 'rel', 'confidence'])
+            
+            # Color and width per distinct value rather than per edge
+            width_map = {'high': 3, 'medium': 2, 'low': 1}
+            edges['color'] = edges['rel'].map(self.relationship_colors).fillna('#7F8C8D')
+            edges['width'] = edges['confidence'].map(width_map).fillna(2).astype('int8')
+            
+            # net.add_edge asserts that both endpoints exist; asserts vanish
+            # under python -O, so drop dangling edges explicitly instead
+            node_ids = set(net.get_nodes())
+            dangling = ~(edges['from'].isin(node_ids) & edges['to'].isin(node_ids))
+            if dangling.any():
+                logger.warning(f"Skipping {int(dangling.sum())} edges with a missing endpoint node")
+                edges = edges[~dangling]
+            
+            self._append_pyvis_edges(net, edges)
+    
+    @staticmethod
+    def _append_pyvis_edges(net: Network, edges: pd.DataFrame):
+        """
+        Add edges between existing nodes to a pyvis Network in one pass.
+        
+        Equivalent to net.add_edge per row (net.add_edges only takes a
+        width), minus its endpoint check, which the caller has done, and its
+        duplicate scan over every existing edge, which makes building an
+        undirected network quadratic. The first edge per node pair still
+        wins there. Relies on net.edges holding Edge.options dicts, as in
+        pyvis 0.3.x.
+        
+        Args:
+            net: Network whose nodes include every edge endpoint
+            edges: DataFrame with from, to, rel, confidence, color and width columns
+        """
+        linked_pairs = set()
+        
+        for from_node, to_node, rel_type, _, color, width in edges.itertuples(index=False, name=None):
+            if not net.directed:
+                pair = frozenset((from_node, to_node))
+                if pair in linked_pairs:
+                    continue
+                linked_pairs.add(pair)
+            
+            edge = Edge(
+                from_node,
+                to_node,
+                net.directed,
+                title=rel_type,
+                label=rel_type,
+                color=color,
+                width=width,
+                arrows='to',
+                font={'size': 10, 'align': 'middle'}
+            )
+            net.edges.append(edge.options)
     
     def get_graph_stats(self) -> Dict:
         """Get statistics about the graph."""
@@ -302,6 +379,11 @@ class GraphBuilder:
         """Clean relationship type for Neo4j."""
         return str(rel_type).upper().replace(" ", "_").replace("-", "_").replace(".", "_")
     
+    @staticmethod
+    def _is_valid_identifier(name: str) -> bool:
+        """Check that a label/relationship type is safe to interpolate into Cypher."""
+        return IDENTIFIER_PATTERN.fullmatch(name) is not None
+    
     @staticmethod
     def _clean_node_label(label: str) -> str:
         """Clean node label for Neo4j."""
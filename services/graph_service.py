@@ -2,7 +2,8 @@
 Graph service - orchestrates all graph operations.
 """
 import streamlit as st
-from typing import Dict, Any
+from neo4j import Driver, READ_ACCESS
+from typing import Dict, Any, Final
 from streamlit.runtime.uploaded_file_manager import UploadedFile
 
 from core.database.connection_manager import Neo4jConnectionManager
@@ -13,16 +14,39 @@ from utils.validators import validate_file
 
 logger = setup_logger(__name__)
 
+# Developer credit pinned to the bottom of the sidebar
+SIDEBAR_FOOTER_HTML: Final[str] = """
+    <div style="position:fixed; bottom:10px; width:230px; font-size:0.85em;">
+        <strong>M.A.Lashari</strong><br>
+        🎓 AI UnderGrad<br>
+        📍 Pakistan<br>
+        Exploring diverse tech stacks<br>
+        <a href='https://www.linkedin.com/in/muhammad-ahmed-lashari-826761289/' target='_blank'>
+            <img src='https://img.shields.io/badge/LinkedIn-0077B5?style=flat&logo=linkedin&logoColor=white' />
+        </a>
+        <a href='https://github.com/Ahmed-lashari' target='_blank'>
+            <img src='https://img.shields.io/badge/GitHub-181717?style=flat&logo=github&logoColor=white' />
+        </a>
+    </div>
+"""
+
 
 class GraphService:
     """Service for managing graph operations."""
     
+    # Bumped on every rebuild; part of the cache key for graph-derived views
+    graph_version = 0
+    
     def __init__(self):
         """Initialize graph service with Neo4j connection."""
         self.connection_manager = Neo4jConnectionManager()
-        self.driver = self.connection_manager.get_driver()
         self.graph_builder = GraphBuilder(self.driver)
     
+    @property
+    def driver(self) -> Driver:
+        """Current driver (replaced on reconnect)."""
+        return self.connection_manager.get_driver()
+    
     def show_connection_status(self):
         """Display connection status in sidebar with bottom developer credit."""
         with st.sidebar:
@@ -31,34 +55,20 @@ class GraphService:
                 st.success("Neo4j: Connected ✓")
                 if st.button("🔄 Reconnect"):
                     self.connection_manager.reconnect()
+                    self.graph_builder.driver = self.driver
                     st.rerun()
             else:
                 st.error("Neo4j: Disconnected ✗")
                 if st.button("🔌 Connect"):
                     self.connection_manager.connect()
+                    self.graph_builder.driver = self.driver
                     st.rerun()
 
             # Flexible spacer
             st.markdown("<br><br><br><br><br><br>", unsafe_allow_html=True)
 
             # Bottom developer credit
-            st.markdown(
-            """
-            <div style="position:fixed; bottom:10px; width:230px; font-size:0.85em;">
-                <strong>M.A.Lashari</strong><br>
-                🎓 AI UnderGrad<br>
-                📍 Pakistan<br>
-                Exploring diverse tech stacks<br>
-                <a href='https://www.linkedin.com/in/muhammad-ahmed-lashari-826761289/' target='_blank'>
-                    <img src='https://img.shields.io/badge/LinkedIn-0077B5?style=flat&logo=linkedin&logoColor=white' />
-                </a>
-                <a href='https://github.com/Ahmed-lashari' target='_blank'>
-                    <img src='https://img.shields.io/badge/GitHub-181717?style=flat&logo=github&logoColor=white' />
-                </a>
-            </div>
-            """,
-            unsafe_allow_html=True
-        )
+            st.markdown(SIDEBAR_FOOTER_HTML, unsafe_allow_html=True)
 
 
     
@@ -99,10 +109,12 @@ class GraphService:
             
             # Create graph
             with st.spinner(f"Creating graph: {graph_name}..."):
-                status_text = st.empty()
-                status_text.text("🗑️ Clearing previous graph...")
                 self.graph_builder.create_app_graph(graph_name, df)
             
+            # Stats and views cached for the previous graph are stale now
+            _fetch_graph_stats.clear()
+            GraphService.graph_version += 1
+            
             return {
                 "success": True,
                 "message": f"Graph '{graph_name}' created successfully!",
@@ -118,25 +130,48 @@ class GraphService:
                 "message": str(e)
             }
     
-    def __del__(self):
-        """Cleanup on deletion."""
-        if hasattr(self, 'connection_manager'):
-            self.connection_manager.close()
-            
-    def get_graph_stats(self) -> dict:
-     """Get statistics about the graph."""
-     with self.driver.session() as session:
-        # Count nodes
-        node_count :int= session.run("MATCH (n) RETURN count(n) as count").single()["count"]
-        
-        # Count relationships
-        rel_count :int= session.run("MATCH ()-[r]->() RETURN count(r) as count").single()["count"]
-        
-        # Count node types
-        node_types :int= session.run("MATCH (n) RETURN count(DISTINCT labels(n)) as count").single()["count"]
+    def get_graph_stats(self, graph_name: str = None) -> dict:
+        """Get statistics about the graph (cached per graph name)."""
+        return _fetch_graph_stats(self.driver, graph_name)
 
+
+@st.cache_resource(show_spinner=False)
+def get_graph_service() -> GraphService:
+    """
+    Process-wide GraphService, so the Neo4j driver and its connection pool
+    survive Streamlit reruns and are shared by all sessions.
+    """
+    return GraphService()
+
+
+# Node, relationship and node type counts in one round trip
+GRAPH_STATS_QUERY = """
+    CALL {
+        MATCH (n)
+        RETURN count(n) AS nodes, count(DISTINCT labels(n)) AS node_types
+    }
+    CALL {
+        MATCH ()-[r]->()
+        RETURN count(r) AS relationships
+    }
+    RETURN nodes, relationships, node_types
+"""
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _fetch_graph_stats(_driver: Driver, graph_name: str) -> dict:
+    """
+    Count nodes, relationships and node types in one round trip.
+    
+    Cached so Streamlit reruns don't query Neo4j again; cleared whenever a
+    graph is rebuilt. The driver is excluded from the cache key.
+    """
+    # Read-only, so a cluster can route it to a follower or read replica
+    with _driver.session(default_access_mode=READ_ACCESS) as session:
+        record = session.execute_read(lambda tx: tx.run(GRAPH_STATS_QUERY).single())
+        
         return {
-            "nodes": node_count,
-            "relationships": rel_count,
-            "node_types": node_types
-        }
\ No newline at end of file
+            "nodes": record["nodes"],
+            "relationships": record["relationships"],
+            "node_types": record["node_types"]
+        }
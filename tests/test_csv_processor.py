@@ -0,0 +1,59 @@
+"""
+Tests that single and chunked CSV reads produce the same frame.
+"""
+import io
+import unittest
+from unittest import mock
+
+import pandas as pd
+
+from config.config import FILE_CONFIG
+from core.processor.csv_processor import CSVProcessor
+
+
+DATE_CSV = (
+    "name,joined,updated,start,score\n"
+    "Ada,2020-01-01,2020-01-01T10:00,09:30,1\n"
+    "Grace,2021-06-15,2021-06-15 08:00:00,10:00:00,2\n"
+    "Alan,,2022-03-01T00:00,,3\n"
+).encode("utf-8")
+
+
+class _Upload(io.BytesIO):
+    """Minimal stand-in for Streamlit's UploadedFile."""
+
+    def __init__(self, data: bytes, name: str = "dates.csv"):
+        super().__init__(data)
+        self.name = name
+        self.size = len(data)
+
+
+class CSVReadPathsTest(unittest.TestCase):
+
+    def read_single(self, data):
+        processor = CSVProcessor(_Upload(data))
+        return processor._clean_dataframe(processor._read_csv("utf-8"))
+
+    def read_chunked(self, data, chunk_rows):
+        processor = CSVProcessor(_Upload(data))
+        with mock.patch.dict(FILE_CONFIG, {"csv_chunk_rows": chunk_rows}):
+            return processor._read_csv_chunked("utf-8", lambda value: None)
+
+    def test_dates_keep_source_text(self):
+        df = self.read_single(DATE_CSV)
+        self.assertEqual(df["joined"].tolist(), ["2020-01-01", "2021-06-15", None])
+        self.assertEqual(
+            df["updated"].tolist(),
+            ["2020-01-01T10:00", "2021-06-15 08:00:00", "2022-03-01T00:00"]
+        )
+        self.assertEqual(df["start"].tolist(), ["09:30", "10:00:00", None])
+
+    def test_single_and_chunked_reads_match(self):
+        single = self.read_single(DATE_CSV)
+        for chunk_rows in (1, 2, 10):
+            with self.subTest(chunk_rows=chunk_rows):
+                pd.testing.assert_frame_equal(self.read_chunked(DATE_CSV, chunk_rows), single)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+"""
+Regression tests for entity-aware relationship pattern matching.
+"""
+import unittest
+from pathlib import Path
+
+from core.nlp.entity_mentions import build_entity_finder, find_entity_mentions
+from core.nlp.relationship_extractor import RelationshipExtractor
+from core.processor.text_processor import _extract_patterns
+
+
+MODEL_PATH = Path(__file__).resolve().parents[1] / "config/data/models/en_core_web_sm/en_core_web_sm-3.8.0"
+
+# "Ted" occurs inside "located"; it must not split Acme ... Paris
+SUBSTRING_ENTITIES = {"Ted": "PERSON", "Acme": "ORG", "Paris": "GPE"}
+SUBSTRING_SENTENCE = "Acme is located in Paris."
+
+# An NER span covering the whole clause must not hide the entities inside it
+NESTED_ENTITIES = {
+    "Grace Lee manages Apple": "PERSON",
+    "Grace Lee": "PERSON",
+    "Apple": "ORG",
+}
+NESTED_SENTENCE = "Grace Lee manages Apple."
+
+
+def _triples(relationships):
+    return {
+        (rel["source"], rel["relationship"], rel["target"], rel["source_type"], rel["target_type"])
+        for rel in relationships
+    }
+
+
+class FindEntityMentionsTest(unittest.TestCase):
+
+    def test_ignores_entities_inside_words(self):
+        finder, names = build_entity_finder(SUBSTRING_ENTITIES)
+        mentions = find_entity_mentions(SUBSTRING_SENTENCE.lower(), finder, names)
+        self.assertEqual([name for _, _, name in mentions], ["Acme", "Paris"])
+
+    def test_keeps_nested_mentions(self):
+        finder, names = build_entity_finder(NESTED_ENTITIES)
+        mentions = find_entity_mentions(NESTED_SENTENCE.lower(), finder, names)
+        self.assertEqual(
+            mentions,
+            [(0, 23, "Grace Lee manages Apple"), (0, 9, "Grace Lee"), (18, 23, "Apple")]
+        )
+
+
+class TextProcessorPatternsTest(unittest.TestCase):
+
+    def extract(self, sentence, entities):
+        return _triples(_extract_patterns([sentence], entities))
+
+    def test_entity_inside_word(self):
+        self.assertEqual(
+            self.extract(SUBSTRING_SENTENCE, SUBSTRING_ENTITIES),
+            {("Acme", "LOCATED_IN", "Paris", "ORG", "GPE")}
+        )
+
+    def test_nested_entity_span(self):
+        self.assertEqual(
+            self.extract(NESTED_SENTENCE, NESTED_ENTITIES),
+            {("Grace Lee", "MANAGES", "Apple", "PERSON", "ORG")}
+        )
+
+
+@unittest.skipUnless(MODEL_PATH.exists(), "bundled spaCy model not available")
+class RelationshipExtractorPatternsTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        import spacy
+        cls.nlp = spacy.load(MODEL_PATH)
+
+    def extract(self, sentence, entities):
+        extractor = RelationshipExtractor()
+        docs = self.nlp.pipe([sentence], disable=["ner"])
+        relationships = extractor.extract_from_docs([sentence], docs, entities)
+        return _triples(relationships.astype(object).to_dict("records"))
+
+    def test_entity_inside_word(self):
+        self.assertIn(
+            ("Acme", "LOCATED_IN", "Paris", "ORG", "GPE"),
+            self.extract(SUBSTRING_SENTENCE, SUBSTRING_ENTITIES)
+        )
+
+    def test_nested_entity_span(self):
+        self.assertIn(
+            ("Grace Lee", "MANAGES", "Apple", "PERSON", "ORG"),
+            self.extract(NESTED_SENTENCE, NESTED_ENTITIES)
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
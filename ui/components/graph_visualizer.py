@@ -6,12 +6,23 @@ import streamlit as st
 from pyvis.network import Network
 from pathlib import Path
 # from config.config import UI_CONFIG
+from services.graph_builder import GraphBuilder
 from services.graph_service import GraphService
 from utils.logger import setup_logger
 
 
 logger = setup_logger(__name__)
 
+# Injected into PyVis' drawGraph(): without it vis.js keeps simulating
+# physics in the browser for as long as the graph is shown
+FREEZE_LAYOUT_JS = """
+                  network.once("stabilizationIterationsDone", function () {
+                      network.setOptions({physics: false});
+                  });"""
+
+# Statement in PyVis' drawGraph() that FREEZE_LAYOUT_JS is inserted before
+FREEZE_LAYOUT_MARKER = "return network;"
+
 
 def render_graph_visualization(graph_service:GraphService,graph_name: str):
     """
@@ -26,71 +37,97 @@ def render_graph_visualization(graph_service:GraphService,graph_name: str):
     
     try:
         with st.spinner("Generating graph visualization..."):
-            # Create PyVis network
-            net = Network(
-                # height=UI_CONFIG["graph_height"],
-                # width=UI_CONFIG["graph_width"],
-                notebook=True,
-                bgcolor="#ffffff",
-                font_color="#000000"
+            html_content = _build_graph_html(
+                graph_service.graph_builder, graph_name, GraphService.graph_version
             )
             
-            # Configure physics
-            net.set_options("""
-            {
-                "physics": {
-                    "enabled": true,
-                    "barnesHut": {
-                        "gravitationalConstant": -8000,
-                        "centralGravity": 0.3,
-                        "springLength": 95,
-                        "springConstant": 0.04
-                    }
-                },
-                "nodes": {
-                    "borderWidth": 2,
-                    "borderWidthSelected": 4,
-                    "font": {
-                        "size": 14,
-                        "face": "arial"
-                    }
-                },
-                "edges": {
-                    "color": {
-                        "inherit": true
-                    },
-                    "smooth": {
-                        "type": "continuous"
-                    }
-                }
-            }
-            """)
-            
-            # Add graph data
-            
-            graph_service.graph_builder.add_to_pyvis(net)
-            
-            # Save and display
-            html_file = "graph.html"
-            net.show(html_file)
-            
-            with open(html_file, "r", encoding="utf-8") as f:
-                html_content = f.read()
-            
             st.components.v1.html(html_content, height=600, scrolling=True)
             
             # Display statistics
-            _display_graph_stats(graph_service)
+            _display_graph_stats(graph_service, graph_name)
             
     except Exception as e:
         logger.error(f"Error visualizing graph: {e}", exc_info=True)
         st.error(f"❌ Error visualizing graph: {e}")
 
 
-def _display_graph_stats(graph_service: GraphService):
+@st.cache_data(ttl=300, show_spinner=False)
+def _build_graph_html(_graph_builder: GraphBuilder, graph_name: str, graph_version: int) -> str:
+    """
+    Build the PyVis HTML for a graph.
+    
+    Cached so reruns from widget interaction don't reload the graph from
+    Neo4j; graph_version changes whenever a graph is rebuilt.
+    """
+    # Create PyVis network
+    net = Network(
+        # height=UI_CONFIG["graph_height"],
+        # width=UI_CONFIG["graph_width"],
+        notebook=True,
+        bgcolor="#ffffff",
+        font_color="#000000"
+    )
+    
+    # Configure physics
+    net.set_options("""
+    {
+        "physics": {
+            "enabled": true,
+            "barnesHut": {
+                "gravitationalConstant": -8000,
+                "centralGravity": 0.3,
+                "springLength": 95,
+                "springConstant": 0.04
+            },
+            "stabilization": {
+                "enabled": true,
+                "iterations": 150,
+                "fit": true
+            },
+            "timestep": 0.5,
+            "minVelocity": 0.75
+        },
+        "configure": {
+            "enabled": false
+        },
+        "nodes": {
+            "borderWidth": 2,
+            "borderWidthSelected": 4,
+            "font": {
+                "size": 14,
+                "face": "arial"
+            }
+        },
+        "edges": {
+            "color": {
+                "inherit": true
+            },
+            "smooth": {
+                "type": "continuous"
+            }
+        }
+    }
+    """)
+    
+    # Add graph data
+    _graph_builder.add_to_pyvis(net)
+    
+    # Render in memory; nothing is written to disk
+    html = net.generate_html(notebook=False)
+    
+    # Stop the simulation once the initial layout has stabilized. PyVis
+    # options are JSON only, so the handler goes in before drawGraph()'s
+    # return; the marker comes from the pinned PyVis template.
+    if FREEZE_LAYOUT_MARKER not in html:
+        logger.warning("PyVis template changed; graph physics will keep running after layout")
+        return html
+    return html.replace(FREEZE_LAYOUT_MARKER, FREEZE_LAYOUT_JS + "\n                  " + FREEZE_LAYOUT_MARKER, 1)
+
+
+def _display_graph_stats(graph_service: GraphService, graph_name: str):
     """Display graph statistics."""
     try:
-        stats = graph_service.get_graph_stats()
+        stats = graph_service.get_graph_stats(graph_name)
         
         st.markdown("#### 📊 Graph Statistics")
         col1, col2, col3 = st.columns(3)
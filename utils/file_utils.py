@@ -7,6 +7,12 @@ from streamlit.runtime.uploaded_file_manager import UploadedFile
 from config.config import UPLOADS_DIR
 from utils.logger import setup_logger
 
+try:
+    import blake3
+except ImportError:
+    # Optional: SIMD/multi-threaded hashing for large uploads
+    blake3 = None
+
 logger = setup_logger(__name__)
 
 
@@ -23,8 +29,13 @@ def save_uploaded_file(uploaded_file: UploadedFile) -> Path:
     try:
         file_path = UPLOADS_DIR / uploaded_file.name
         
-        with open(file_path, "wb") as f:
-            f.write(uploaded_file.getbuffer())
+        # Unbuffered: the memoryview goes straight to write(2) instead of
+        # being copied through Python's file buffer first. A raw write may
+        # be partial, so continue from where it stopped.
+        with open(file_path, "wb", buffering=0) as f:
+            view = uploaded_file.getbuffer()
+            while view:
+                view = view[f.write(view):]
         
         logger.info(f"Saved file: {file_path}")
         return file_path
@@ -36,14 +47,25 @@ def save_uploaded_file(uploaded_file: UploadedFile) -> Path:
 
 def get_file_hash(uploaded_file: UploadedFile) -> str:
     """
-    Get MD5 hash of uploaded file.
+    Get content hash of uploaded file.
+    
+    Uses BLAKE3 when installed, otherwise BLAKE2b; both are much faster
+    than MD5. Digests differ between the two, so compare hashes only
+    within one install.
     
     Args:
         uploaded_file: Streamlit UploadedFile
     
     Returns:
-        MD5 hash string
+        Hex digest string
     """
-    file_hash = hashlib.md5()
+    file_hash = _new_hasher()
     file_hash.update(uploaded_file.getbuffer())
-    return file_hash.hexdigest()
\ No newline at end of file
+    return file_hash.hexdigest()
+
+
+def _new_hasher():
+    """BLAKE3 hasher when installed, otherwise BLAKE2b."""
+    if blake3 is not None:
+        return blake3.blake3(max_threads=blake3.blake3.AUTO)
+    return hashlib.blake2b(digest_size=32)
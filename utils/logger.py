@@ -1,31 +1,50 @@
 """
 Logging configuration.
 """
+import atexit
 import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
 from config.config import LOG_CONFIG
 
 
+# Records from every logger go through this queue; file and console
+# writes happen on the listener's background thread
+LOG_QUEUE = queue.Queue(-1)
+
+
+def _start_listener() -> QueueListener:
+    """Start the shared file + console writer thread."""
+    # Formatter
+    formatter = logging.Formatter(LOG_CONFIG["format"])
+    
+    # File handler
+    fh = logging.FileHandler(LOG_CONFIG["file"])
+    fh.setLevel(LOG_CONFIG["level"])
+    fh.setFormatter(formatter)
+    
+    # Console handler
+    ch = logging.StreamHandler()
+    ch.setLevel(LOG_CONFIG["level"])
+    ch.setFormatter(formatter)
+    
+    listener = QueueListener(LOG_QUEUE, fh, ch, respect_handler_level=True)
+    listener.start()
+    
+    # Drain queued records before the interpreter exits
+    atexit.register(listener.stop)
+    return listener
+
+
+_listener = _start_listener()
+
+
 def setup_logger(name: str) -> logging.Logger:
     """Setup logger with consistent configuration."""
     logger = logging.getLogger(name)
     
     if not logger.handlers:
         logger.setLevel(LOG_CONFIG["level"])
-        
-        # File handler
-        fh = logging.FileHandler(LOG_CONFIG["file"])
-        fh.setLevel(LOG_CONFIG["level"])
-        
-        # Console handler
-        ch = logging.StreamHandler()
-        ch.setLevel(LOG_CONFIG["level"])
-        
-        # Formatter
-        formatter = logging.Formatter(LOG_CONFIG["format"])
-        fh.setFormatter(formatter)
-        ch.setFormatter(formatter)
-        
-        logger.addHandler(fh)
-        logger.addHandler(ch)
+        logger.addHandler(QueueHandler(LOG_QUEUE))
     
-    return logger
\ No newline at end of file
+    return logger
@@ -2,7 +2,9 @@
 Text processing utilities.
 """
 import re
+import threading
 import nltk
+from collections import Counter
 from typing import List
 from pathlib import Path
 from config.config import NLP_CONFIG
@@ -10,6 +12,28 @@ from utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+# Patterns compiled once at import rather than looked up per call
+WHITESPACE_PATTERN = re.compile(r'\s+')
+SPECIAL_CHARS_PATTERN = re.compile(r"[^\w\s.,;!?'-]")
+SENTENCE_END_PATTERN = re.compile(r'[.!?]+\s+')
+KEYWORD_PATTERN = re.compile(r'\b[a-z]{3,}\b')
+
+# str.translate table deleting the ASCII characters SPECIAL_CHARS_PATTERN removes
+SPECIAL_CHARS_TABLE = str.maketrans('', '', ''.join(
+    char for char in map(chr, range(128))
+    if not (char.isalnum() or char == '_' or char.isspace() or char in ".,;!?'-")
+))
+
+# Common English stop words
+STOP_WORDS = frozenset({
+    'the', 'and', 'for', 'are', 'but', 'not', 'you', 'all', 'can', 
+    'her', 'was', 'one', 'our', 'out', 'day', 'get', 'has', 'him', 
+    'his', 'how', 'man', 'new', 'now', 'old', 'see', 'two', 'way', 
+    'who', 'boy', 'did', 'its', 'let', 'put', 'say', 'she', 'too', 
+    'use', 'with', 'from', 'have', 'this', 'that', 'will', 'than',
+    'been', 'were', 'said', 'each', 'which', 'their', 'there', 'would'
+})
+
 
 def ensure_nltk_data():
     """Ensure required NLTK data is available (don't auto-download)."""
@@ -44,8 +68,24 @@ def ensure_nltk_data():
             )
 
 
-# Ensure NLTK data on import
-ensure_nltk_data()
+# NLTK data is checked on first tokenization rather than at import
+_nltk_checked = False
+_nltk_lock = threading.Lock()
+
+
+def _ensure_nltk_data_once():
+    """Run ensure_nltk_data a single time, even with concurrent callers."""
+    global _nltk_checked
+    if _nltk_checked:
+        return
+    with _nltk_lock:
+        if not _nltk_checked:
+            try:
+                ensure_nltk_data()
+            finally:
+                # A failed check falls back to the simple tokenizer instead
+                # of retrying the download on every call
+                _nltk_checked = True
 
 
 def clean_text(text: str) -> str:
@@ -59,11 +99,14 @@ def clean_text(text: str) -> str:
         Cleaned text
     """
     # Normalize whitespace
-    text = re.sub(r'\s+', ' ', text)
+    text = WHITESPACE_PATTERN.sub(' ', text)
     
     # Keep punctuation for sentence detection
-    # Only remove excessive special characters
-    text = re.sub(r'[^\w\s.,;!?\'-]', '', text)
+    # Only remove excessive special characters; the translate table covers
+    # ASCII, so the regex only runs when other characters remain
+    text = text.translate(SPECIAL_CHARS_TABLE)
+    if not text.isascii():
+        text = SPECIAL_CHARS_PATTERN.sub('', text)
     
     # Strip leading/trailing whitespace
     text = text.strip()
@@ -82,6 +125,7 @@ def tokenize_sentences(text: str) -> List[str]:
         List of sentences
     """
     try:
+        _ensure_nltk_data_once()
         sentences = nltk.sent_tokenize(text)
         return [s.strip() for s in sentences if s.strip()]
     except LookupError as e:
@@ -103,14 +147,13 @@ def _fallback_sentence_tokenize(text: str) -> List[str]:
     Returns:
         List of sentences
     """
-    # Split by common sentence endings
-    sentences = re.split(r'[.!?]+\s+', text)
-    
-    # Clean and filter empty sentences
-    sentences = [s.strip() for s in sentences if s.strip()]
-    
-    # Re-add periods to sentences
-    sentences = [s if s.endswith(('.', '!', '?')) else s + '.' for s in sentences]
+    # Split by common sentence endings, drop empty pieces and re-add
+    # periods in one pass
+    sentences = [
+        s if s.endswith(('.', '!', '?')) else s + '.'
+        for s in map(str.strip, SENTENCE_END_PATTERN.split(text))
+        if s
+    ]
     
     logger.warning("Using fallback sentence tokenizer")
     return sentences
@@ -127,23 +170,12 @@ def extract_keywords(text: str, top_n: int = 10) -> List[str]:
     Returns:
         List of keywords
     """
-    # Extract words (3+ characters)
-    words = re.findall(r'\b[a-z]{3,}\b', text.lower())
-    
-    # Common English stop words
-    stop_words = {
-        'the', 'and', 'for', 'are', 'but', 'not', 'you', 'all', 'can', 
-        'her', 'was', 'one', 'our', 'out', 'day', 'get', 'has', 'him', 
-        'his', 'how', 'man', 'new', 'now', 'old', 'see', 'two', 'way', 
-        'who', 'boy', 'did', 'its', 'let', 'put', 'say', 'she', 'too', 
-        'use', 'with', 'from', 'have', 'this', 'that', 'will', 'than',
-        'been', 'were', 'said', 'each', 'which', 'their', 'there', 'would'
-    }
-    
-    words = [w for w in words if w not in stop_words]
-    
-    # Count frequency
-    from collections import Counter
-    word_freq = Counter(words)
+    # Count words (3+ characters) straight from the match iterator,
+    # without intermediate word lists
+    word_freq = Counter(
+        word
+        for word in map(re.Match.group, KEYWORD_PATTERN.finditer(text.lower()))
+        if word not in STOP_WORDS
+    )
     
     return [word for word, _ in word_freq.most_common(top_n)]
\ No newline at end of file
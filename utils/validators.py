@@ -1,10 +1,14 @@
 """
 File and data validation utilities.
 """
+from pathlib import Path
 from typing import Dict
 from streamlit.runtime.uploaded_file_manager import UploadedFile
 from config.config import FILE_CONFIG
 
+# Lowercased allowed extensions for O(1) suffix lookup
+ALLOWED_EXTENSIONS = frozenset(ext.lower() for ext in FILE_CONFIG["allowed_extensions"])
+
 
 def validate_file(uploaded_file: UploadedFile) -> Dict[str, any]:
     """
@@ -14,10 +18,7 @@ def validate_file(uploaded_file: UploadedFile) -> Dict[str, any]:
         Dict with 'valid' boolean and optional 'error' message
     """
     # Check file extension
-    filename = uploaded_file.name.lower()
-    valid_ext = any(filename.endswith(ext) for ext in FILE_CONFIG["allowed_extensions"])
-    
-    if not valid_ext:
+    if Path(uploaded_file.name).suffix.lower() not in ALLOWED_EXTENSIONS:
         return {
             "valid": False,
             "error": f"Invalid file type. Allowed: {', '.join(FILE_CONFIG['allowed_extensions'])}"